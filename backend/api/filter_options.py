@@ -15,8 +15,9 @@ Response shape (backward compatible):
 
 from __future__ import annotations
 
+import heapq
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 from flask import Blueprint, jsonify, request
 
@@ -69,7 +70,7 @@ def _distinct_with_optional_q(coll, field: str, q: str, limit: int) -> List[str]
     Uses distinct() and filters in Python.
     """
     raw = coll.distinct(field)
-    vals: List[str] = []
+    vals: Set[str] = set()  # distinct() dedups raw values; stripping can collide them
     qn = q.lower()
     for v in raw:
         if v is None:
@@ -79,11 +80,10 @@ def _distinct_with_optional_q(coll, field: str, q: str, limit: int) -> List[str]
             continue
         if q and qn not in s.lower():
             continue
-        vals.append(s)
-    vals = sorted(list(set(vals)))
+        vals.add(s)
     if limit and limit > 0:
-        vals = vals[:limit]
-    return vals
+        return heapq.nsmallest(limit, vals)
+    return sorted(vals)
 
 
 def _split_field_suggestions(
@@ -272,7 +272,7 @@ def get_vax_types():
 
         db = get_db()
         values = _distinct_with_optional_q(db["vaers_vax"], "VAX_TYPE", q=q, limit=limit)
-        values = sorted(list({str(v).upper().strip() for v in values if str(v).strip()}))[:limit]
+        values = heapq.nsmallest(limit, {str(v).upper().strip() for v in values if str(v).strip()})
 
         CACHE.set(key, values, ttl_seconds=3600)
         return jsonify({"values": values})
@@ -20,37 +20,10 @@ def get_state_counts():
     handlers for died/hospital/strict-serious.
     """
     try:
+        # died/hospital/strict-serious handled by build_filters (shared with search.py)
         f, data_match, join_filters = build_filters(request)
         db = get_db()
 
-        # --- Manual Filter Logic (Must match search.py) ---
-
-        # 1. Died
-        died_arg = request.args.get("died", "").strip().lower()
-        if died_arg == "true":
-            data_match["DIED"] = "Y"
-        elif died_arg == "false":
-            data_match["DIED"] = {"$ne": "Y"}
-
-        # 2. Hospital
-        hosp_arg = request.args.get("hospital", "").strip().lower()
-        if hosp_arg == "true":
-            data_match["HOSPITAL"] = "Y"
-        elif hosp_arg == "false":
-            data_match["HOSPITAL"] = {"$ne": "Y"}
-
-        # 3. Serious = False (Strict Non-Serious)
-        serious_arg = request.args.get("serious_only", "").strip().lower()
-        if serious_arg == "false":
-            serious_flags = ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]
-            for flag in serious_flags:
-                if flag not in data_match:
-                     data_match[flag] = {"$ne": "Y"}
-                else:
-                     data_match[flag] = {"$ne": "Y"}
-
-        # --------------------------------------------------
-
         base_id_cap = int(request.args.get("base_id_cap", "0") or 0)
 
         # Get filtered base IDs using join filters
@@ -20,27 +20,9 @@ def get_onset_distribution():
     Respects both 'onset_days_min' and 'onset_days_max' filters.
     """
     try:
-        # 1. Build standard filters
+        # 1-2. Build standard filters (incl. died/hospital/strict-serious)
         f, data_match, join_filters = build_filters(request)
 
-        # 2. Manual Filter Logic
-        died_arg = request.args.get("died", "").strip().lower()
-        if died_arg == "true":
-            data_match["DIED"] = "Y"
-        elif died_arg == "false":
-            data_match["DIED"] = {"$ne": "Y"}
-
-        hosp_arg = request.args.get("hospital", "").strip().lower()
-        if hosp_arg == "true":
-            data_match["HOSPITAL"] = "Y"
-        elif hosp_arg == "false":
-            data_match["HOSPITAL"] = {"$ne": "Y"}
-
-        serious_arg = request.args.get("serious_only", "").strip().lower()
-        if serious_arg == "false":
-            for flag in ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]:
-                data_match[flag] = {"$ne": "Y"}
-
         # 3. Handle Join Filters
         base_id_cap = int(request.args.get("base_id_cap", "0") or 0)
         base_ids = _get_base_ids(data_match, join_filters, base_id_cap=base_id_cap)
@@ -22,28 +22,9 @@ def get_outcomes_summary():
     - Onset Days calculation and filtering
     """
     try:
-        # 1. Standard Filters
+        # 1-2. Standard Filters (incl. Died / Hospital / Strict Non-Serious)
         f, data_match, join_filters = build_filters(request)
 
-        # 2. Manual Filter Logic (Died / Hospital / Strict Non-Serious)
-        died_arg = request.args.get("died", "").strip().lower()
-        if died_arg == "true":
-            data_match["DIED"] = "Y"
-        elif died_arg == "false":
-            data_match["DIED"] = {"$ne": "Y"}
-
-        hosp_arg = request.args.get("hospital", "").strip().lower()
-        if hosp_arg == "true":
-            data_match["HOSPITAL"] = "Y"
-        elif hosp_arg == "false":
-            data_match["HOSPITAL"] = {"$ne": "Y"}
-
-        serious_arg = request.args.get("serious_only", "").strip().lower()
-        if serious_arg == "false":
-            serious_flags = ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]
-            for flag in serious_flags:
-                data_match[flag] = {"$ne": "Y"}
-
         # 3. Handle Join Filters
         base_id_cap = int(request.args.get("base_id_cap", "0") or 0)
         base_ids = _get_base_ids(data_match, join_filters, base_id_cap=base_id_cap)
@@ -1,6 +1,7 @@
 # backend/api/search.py
 from __future__ import annotations
 
+from dataclasses import asdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -51,30 +52,9 @@ def search_reports():
     - Applies 'Onset Days' filter BEFORE limiting results to ensure accuracy.
     - Supports died/hospital/strict-serious logic.
     """
+    # --- 1. Standard Filters (incl. died/hospital/strict-serious) ---
     f, data_match, join_filters = build_filters(request)
 
-    # --- 1. Manual Filter Logic ---
-    died_arg = request.args.get("died", "").strip().lower()
-    if died_arg == "true":
-        data_match["DIED"] = "Y"
-    elif died_arg == "false":
-        data_match["DIED"] = {"$ne": "Y"}
-
-    hosp_arg = request.args.get("hospital", "").strip().lower()
-    if hosp_arg == "true":
-        data_match["HOSPITAL"] = "Y"
-    elif hosp_arg == "false":
-        data_match["HOSPITAL"] = {"$ne": "Y"}
-
-    serious_arg = request.args.get("serious_only", "").strip().lower()
-    if serious_arg == "false":
-        serious_flags = ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]
-        for flag in serious_flags:
-            if flag not in data_match:
-                data_match[flag] = {"$ne": "Y"}
-            else:
-                data_match[flag] = {"$ne": "Y"}
-
     # --- 2. Onset Days Filters ---
     # We must detect these to decide pipeline order
     onset_min_raw = request.args.get("onset_days_min", "").strip()
@@ -273,7 +253,7 @@ def search_reports():
         {
             "time_utc": datetime.utcnow().isoformat() + "Z",
             "filters": {
-                "parsed": f.__dict__,
+                "parsed": asdict(f),
                 "vaers_data_match": data_match,
                 "join_filters": join_filters,
                 "uses_join_prefilter": bool(has_join),
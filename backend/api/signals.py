@@ -1,15 +1,20 @@
 # backend/api/signals.py
 from __future__ import annotations
 
+import heapq
+from dataclasses import asdict
 from datetime import datetime
 from math import exp, log, sqrt
+from operator import itemgetter
 from typing import Any, Dict, List, Tuple, Optional
 
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, request
 
 from backend.db.mongo import get_db
-from backend.services.cache import CACHE, stable_hash
+from backend.services.cache import CACHE, hash_bytes
 from backend.services.filters import build_filters
+from backend.services.join_ids import get_join_ids
 
 bp = Blueprint("signals_api", __name__, url_prefix="/api")
 
@@ -94,43 +99,8 @@ def _get_base_ids(
     """
     db = get_db()
 
-    vax_type = join_filters.get("vax_type")
-    vax_manu = join_filters.get("vax_manu")
-    symptom_term = join_filters.get("symptom_term")
-
-    base_ids_set = None
-
-    # 1. Pre-filter by Vaccine Table
-    if vax_type or vax_manu:
-        vax_match: Dict[str, Any] = {}
-        if vax_type: vax_match["VAX_TYPE"] = vax_type
-        if vax_manu: vax_match["VAX_MANU"] = vax_manu
-
-        vax_ids = set(
-            doc["VAERS_ID"]
-            for doc in db["vaers_vax"].find(vax_match, {"VAERS_ID": 1})
-            if doc.get("VAERS_ID") is not None
-        )
-        base_ids_set = vax_ids
-
-    # 2. Pre-filter by Symptom Table
-    if symptom_term:
-        pt = symptom_term.strip()
-        sym_match = {
-            "$or": [
-                {"SYMPTOM1": pt}, {"SYMPTOM2": pt}, {"SYMPTOM3": pt}, {"SYMPTOM4": pt}, {"SYMPTOM5": pt},
-            ]
-        }
-        sym_ids = set(
-            doc["VAERS_ID"]
-            for doc in db["vaers_symptoms"].find(sym_match, {"VAERS_ID": 1})
-            if doc.get("VAERS_ID") is not None
-        )
-
-        if base_ids_set is not None:
-            base_ids_set = base_ids_set.intersection(sym_ids)
-        else:
-            base_ids_set = sym_ids
+    # 1-2. Pre-filter by Vaccine / Symptom Tables
+    base_ids_set = get_join_ids(join_filters)
 
     # 3. Combine with Main Data Filters
     final_match = data_match.copy()
@@ -280,27 +250,9 @@ def signals():
     Filters: Standard, Manual, AND Onset Days.
     Safety: ENFORCES 50k hard cap.
     """
+    # 1. Standard Filters (incl. died/hospital/strict-serious)
     f, data_match, join_filters = build_filters(request)
 
-    # 1. --- Manual Filter Logic ---
-    died_arg = request.args.get("died", "").strip().lower()
-    if died_arg == "true":
-        data_match["DIED"] = "Y"
-    elif died_arg == "false":
-        data_match["DIED"] = {"$ne": "Y"}
-
-    hosp_arg = request.args.get("hospital", "").strip().lower()
-    if hosp_arg == "true":
-        data_match["HOSPITAL"] = "Y"
-    elif hosp_arg == "false":
-        data_match["HOSPITAL"] = {"$ne": "Y"}
-
-    serious_arg = request.args.get("serious_only", "").strip().lower()
-    if serious_arg == "false":
-        for flag in ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]:
-            data_match[flag] = {"$ne": "Y"}
-    # ------------------------------
-
     # 2. Extract Onset Filters
     onset_min_raw = request.args.get("onset_days_min", "").strip()
     onset_max_raw = request.args.get("onset_days_max", "").strip()
@@ -334,15 +286,14 @@ def signals():
     # We ignore user input here to guarantee stability.
     base_id_cap = 50000
 
-    cache_key = stable_hash({
-        "endpoint": "signals_v5",
-        "args": request.args.to_dict(flat=True),
-        "hard_cap": base_id_cap
-    })
+    # The response is a function of the query string alone, so its raw bytes are the key
+    # (no JSON canonicalization; the prefix versions the endpoint and the hard cap)
+    cache_key = f"signals_v5:{base_id_cap}:" + hash_bytes(request.query_string)
 
+    # Hits are served straight from the cached JSON bytes (immutable; nothing to re-serialize)
     cached = CACHE.get(cache_key)
     if cached is not None:
-        return jsonify({**cached, "cached": True})
+        return Response(cached, mimetype="application/json")
 
     def compute():
         # Pass onset filters to ID fetcher
@@ -359,7 +310,7 @@ def signals():
             return {
                 "time_utc": datetime.utcnow().isoformat() + "Z",
                 "cached": False,
-                "filters": {"parsed": f.__dict__, "vaers_data_match": data_match, "join_filters": join_filters},
+                "filters": {"parsed": asdict(f), "vaers_data_match": data_match, "join_filters": join_filters},
                 "N": 0,
                 "rows": [],
                 "message": "No reports matched the filters.",
@@ -372,7 +323,7 @@ def signals():
         # Build Top 3 Symptoms for Context
         top_symptoms: List[Dict[str, Any]] = []
         if not join_filters.get("symptom_term"):
-            sorted_symptoms = sorted(sym_marg.items(), key=lambda x: x[1], reverse=True)[:3]
+            sorted_symptoms = heapq.nlargest(3, sym_marg.items(), key=itemgetter(1))
             top_symptoms = [{"symptom": sym, "count": count} for sym, count in sorted_symptoms]
 
         rows: List[Dict[str, Any]] = []
@@ -420,7 +371,7 @@ def signals():
         result_dict = {
             "time_utc": datetime.utcnow().isoformat() + "Z",
             "cached": False,
-            "filters": {"parsed": f.__dict__, "vaers_data_match": data_match, "join_filters": join_filters},
+            "filters": {"parsed": asdict(f), "vaers_data_match": data_match, "join_filters": join_filters},
             "N": N,
             "params": {
                 "min_count": min_count,
@@ -437,8 +388,8 @@ def signals():
         return result_dict
 
     result = compute()
-    CACHE.set(cache_key, result, ttl_seconds=45)
-    return jsonify(result)
+    CACHE.set(cache_key, orjson.dumps({**result, "cached": True}), ttl_seconds=45)
+    return Response(orjson.dumps(result), mimetype="application/json")
 
 
 def main() -> None:
@@ -1,44 +1,47 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, jsonify, request
 
 from backend.db.mongo import get_db
 from backend.services.filters import build_filters
+from backend.services.join_ids import get_join_ids
 
 bp = Blueprint("trends", __name__, url_prefix="/api")
 
+# (monotonic time, ISO string) of the last formatted timestamp.
+# Swapped as one tuple so readers never see a half-updated pair.
+_last_ts: tuple[float, str] = (float("-inf"), "")
+
+
+def _now_iso() -> str:
+    """
+    UTC ISO timestamp, re-formatted at most once per second.
+    Second resolution is plenty for the "time_utc" display field.
+    """
+    global _last_ts
+    t = time.monotonic()
+    if t - _last_ts[0] >= 1.0:
+        _last_ts = (t, datetime.utcnow().isoformat())
+    return _last_ts[1]
+
 
 @bp.get("/trends")
 def trends():
     """
     Returns aggregation of reports over time (Monthly).
     Counts ALL matching records (no 50k cap).
+
+    Series is returned as parallel arrays: {"months": ["2023-07", ...], "counts": [n, ...]}.
     """
     try:
+        # Includes died/hospital/strict-serious toggles
         f, data_match, join_filters = build_filters(request)
 
-        # --- Manual Filter Logic ---
-        died_arg = request.args.get("died", "").strip().lower()
-        if died_arg == "true":
-            data_match["DIED"] = "Y"
-        elif died_arg == "false":
-            data_match["DIED"] = {"$ne": "Y"}
-
-        hosp_arg = request.args.get("hospital", "").strip().lower()
-        if hosp_arg == "true":
-            data_match["HOSPITAL"] = "Y"
-        elif hosp_arg == "false":
-            data_match["HOSPITAL"] = {"$ne": "Y"}
-
-        serious_arg = request.args.get("serious_only", "").strip().lower()
-        if serious_arg == "false":
-            for flag in ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]:
-                data_match[flag] = {"$ne": "Y"}
-        # ---------------------------
-
         # Default to 12 months if not specified
         clip_raw = request.args.get("clip_months")
         if clip_raw is None or clip_raw.strip() == "":
@@ -56,44 +59,15 @@ def trends():
         # No 'base_id_cap' limitation for Trends.
         pipeline = []
 
-        # 1. Filter by Main Data (Sex, Age, Year, State)
-        pipeline.append({"$match": data_match})
+        # 1-3. Vaccine / Symptom join filters become a VAERS_ID prefilter.
+        # Both child collections are queried on their own indexes (concurrently
+        # when both are set) instead of chaining per-document $lookups.
+        join_ids = get_join_ids(join_filters)
+        if join_ids is not None:
+            data_match = {**data_match, "VAERS_ID": {"$in": list(join_ids)}}
 
-        # 2. Join with Vaccine Table if needed
-        if join_filters.get("vax_type") or join_filters.get("vax_manu"):
-            pipeline.append({
-                "$lookup": {
-                    "from": "vaers_vax",
-                    "localField": "VAERS_ID",
-                    "foreignField": "VAERS_ID",
-                    "as": "_vax"
-                }
-            })
-            v_match = {}
-            if join_filters.get("vax_type"): v_match["_vax.VAX_TYPE"] = join_filters["vax_type"]
-            if join_filters.get("vax_manu"): v_match["_vax.VAX_MANU"] = join_filters["vax_manu"]
-            pipeline.append({"$match": v_match})
-
-        # 3. Join with Symptoms Table if needed
-        if join_filters.get("symptom_term"):
-            term = join_filters["symptom_term"]
-            pipeline.append({
-                "$lookup": {
-                    "from": "vaers_symptoms",
-                    "localField": "VAERS_ID",
-                    "foreignField": "VAERS_ID",
-                    "as": "_sym"
-                }
-            })
-            pipeline.append({
-                "$match": {
-                    "$or": [
-                        {"_sym.SYMPTOM1": term}, {"_sym.SYMPTOM2": term},
-                        {"_sym.SYMPTOM3": term}, {"_sym.SYMPTOM4": term},
-                        {"_sym.SYMPTOM5": term}
-                    ]
-                }
-            })
+        # Filter by Main Data (Sex, Age, Year, State) + join IDs
+        pipeline.append({"$match": data_match})
 
         # 4. Project & Group by Date
         pipeline.extend([
@@ -114,30 +88,34 @@ def trends():
             {"$sort": {"_id.y": 1, "_id.m": 1}}
         ])
 
-        raw_series = list(coll.aggregate(pipeline, allowDiskUse=True))
+        # Grouped output is at most a few hundred months, so one large batch
+        # drains the cursor in a single round-trip.
+        raw_series = list(coll.aggregate(pipeline, allowDiskUse=True, batchSize=1000))
 
-        series = []
-        for item in raw_series:
-            y = item["_id"]["y"]
-            m = item["_id"]["m"]
-            label = f"{y}-{m:02d}"
-            series.append({"month": label, "n": item["n"]})
+        # Parallel arrays instead of one dict per point: fewer allocations, smaller payload
+        months = [f"{item['_id']['y']}-{item['_id']['m']:02d}" for item in raw_series]
+        counts = [item["n"] for item in raw_series]
 
         # Calculate total points BEFORE clipping to get the true "Base N" for this timeline
-        total_points = sum(p["n"] for p in series)
+        total_points = sum(counts)
 
         # Apply Clip (Python side) - show only last N months
         if clip_months > 0:
-            series = series[-clip_months:]
-
-        displayed_points = sum(p["n"] for p in series)
-
-        return jsonify({
-            "series": series,
-            "points": displayed_points,
-            "N_base": total_points,
-            "time_utc": datetime.utcnow().isoformat()
-        })
+            months = months[-clip_months:]
+            counts = counts[-clip_months:]
+
+        displayed_points = sum(counts)
+
+        return Response(
+            orjson.dumps({
+                "months": months,
+                "counts": counts,
+                "points": displayed_points,
+                "N_base": total_points,
+                "time_utc": _now_iso()
+            }),
+            mimetype="application/json",
+        )
 
     except Exception as e:
-        return jsonify({"error": str(e), "series": []}), 500
\ No newline at end of file
+        return jsonify({"error": str(e), "months": [], "counts": []}), 500
\ No newline at end of file
@@ -89,12 +89,31 @@ def create_indexes():
     # Foreign key for joins
     vaers_symptoms.create_index([("VAERS_ID", ASCENDING)], name="idx_vaers_id")
 
-    # Symptom term fields (SYMPTOM1-5 are the most commonly queried)
-    vaers_symptoms.create_index([("SYMPTOM1", ASCENDING)], name="idx_symptom1")
-    vaers_symptoms.create_index([("SYMPTOM2", ASCENDING)], name="idx_symptom2")
-    vaers_symptoms.create_index([("SYMPTOM3", ASCENDING)], name="idx_symptom3")
-    vaers_symptoms.create_index([("SYMPTOM4", ASCENDING)], name="idx_symptom4")
-    vaers_symptoms.create_index([("SYMPTOM5", ASCENDING)], name="idx_symptom5")
+    # Symptom terms: SYMPTOM1-5 merged into one SYMPTOMS array (written at ingest).
+    # Backfill docs loaded before that field existed, then index it once (multikey),
+    # so a term lookup is a single equality seek instead of a 5-way $or.
+    res = vaers_symptoms.update_many(
+        {"SYMPTOMS": {"$exists": False}},
+        [{
+            "$set": {
+                "SYMPTOMS": {
+                    "$setDifference": [
+                        ["$SYMPTOM1", "$SYMPTOM2", "$SYMPTOM3", "$SYMPTOM4", "$SYMPTOM5"],
+                        [None, ""],
+                    ]
+                }
+            }
+        }],
+    )
+    if res.modified_count:
+        print(f"  Backfilled SYMPTOMS on {res.modified_count:,} documents")
+
+    existing = vaers_symptoms.index_information()
+    for old in ("idx_symptom1", "idx_symptom2", "idx_symptom3", "idx_symptom4", "idx_symptom5"):
+        if old in existing:
+            vaers_symptoms.drop_index(old)
+
+    vaers_symptoms.create_index([("SYMPTOMS", ASCENDING)], name="idx_symptoms")
 
     print(f"  Created {len(vaers_symptoms.index_information())} indexes on vaers_symptoms")
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
@@ -45,10 +46,12 @@ def get_client(settings: Optional[MongoSettings] = None) -> MongoClient:
 
     # serverSelectionTimeoutMS avoids long hangs if Mongo is down.
     # appname shows up in Mongo logs/metrics.
+    # compressors: wire compression, negotiated with the server (first supported wins).
     return MongoClient(
         s.uri,
         appname=s.app_name,
         serverSelectionTimeoutMS=int(os.getenv("MONGO_TIMEOUT_MS", "5000")),
+        compressors=os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib").strip() or None,
     )
 
 
@@ -77,13 +80,16 @@ def quick_counts(settings: Optional[MongoSettings] = None) -> dict:
     """
     db = get_db(settings)
     expected = ["vaers_data", "vaers_vax", "vaers_symptoms"]
-    out = {"db": db.name, "collections": {}}
-    for name in expected:
-        if name in db.list_collection_names():
-            out["collections"][name] = db[name].estimated_document_count()
-        else:
-            out["collections"][name] = None
-    return out
+    present = set(db.list_collection_names())
+
+    def _count(name: str) -> Optional[int]:
+        return db[name].estimated_document_count() if name in present else None
+
+    # Counts are independent round-trips; issue them concurrently.
+    with ThreadPoolExecutor(max_workers=len(expected)) as ex:
+        counts = list(ex.map(_count, expected))
+
+    return {"db": db.name, "collections": dict(zip(expected, counts))}
 
 
 def main() -> None:
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Bake the medical term reverse mappings into a literal module.
+
+medical_terms_dict.py imports MEDICATION/CONDITION/ALLERGY/VACCINE_LOOKUP from
+medical_lookups_generated.py, so importing it (in the preprocessor and in every
+worker process) does no construction work. Re-run after editing the
+*_STANDARDIZATION dicts:
+    python backend/scripts/generate_lookups.py
+"""
+from __future__ import annotations
+
+import pprint
+from pathlib import Path
+
+from medical_terms_dict import (
+    ALLERGY_STANDARDIZATION,
+    CONDITION_STANDARDIZATION,
+    MEDICATION_STANDARDIZATION,
+    VACCINE_STANDARDIZATION,
+    create_reverse_mapping,
+)
+
+OUT_PATH = Path(__file__).resolve().parent / "medical_lookups_generated.py"
+
+SOURCES = {
+    "MEDICATION_LOOKUP": MEDICATION_STANDARDIZATION,
+    "CONDITION_LOOKUP": CONDITION_STANDARDIZATION,
+    "ALLERGY_LOOKUP": ALLERGY_STANDARDIZATION,
+    "VACCINE_LOOKUP": VACCINE_STANDARDIZATION,
+}
+
+
+def main():
+    parts = [
+        '"""\n'
+        "AUTO-GENERATED by generate_lookups.py from the *_STANDARDIZATION dicts in\n"
+        "medical_terms_dict.py. Do not edit by hand; re-run the generator instead.\n"
+        '"""\n'
+    ]
+    for name, source in SOURCES.items():
+        lookup = create_reverse_mapping(source)
+        parts.append(f"{name} = {pprint.pformat(lookup, sort_dicts=False)}\n")
+
+    OUT_PATH.write_text("\n".join(parts), encoding="utf-8")
+    print(f"[OK] Wrote {OUT_PATH.name} ({', '.join(SOURCES)})")
+
+
+if __name__ == "__main__":
+    main()
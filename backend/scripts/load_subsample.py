@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import codecs
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
+import bson
 from dotenv import load_dotenv
-from pymongo import MongoClient, UpdateOne
+from pymongo import IndexModel, MongoClient, UpdateOne
 from pymongo.collection import Collection
 
 
@@ -32,31 +36,47 @@ MONGO_DB  = os.getenv("MONGO_DB", "vaers_dev")
 ENCODINGS = [os.getenv("VAERS_CSV_ENCODING", "").strip(), "utf-8", "utf-8-sig", "cp1252", "latin1"]
 ENCODINGS = [e for e in ENCODINGS if e]
 
+SYMPTOM_FIELDS = ("SYMPTOM1", "SYMPTOM2", "SYMPTOM3", "SYMPTOM4", "SYMPTOM5")
+
+# Docs per insert batch (~1-2 KB each, well under the 16 MB BSON / 48 MB message limits)
+BATCH_SIZE = 10_000
+
+if not bson.has_c():
+    print("[WARN] pymongo BSON C extension not available; bulk loads will be slow.")
+    print("[WARN] Reinstall with: pip install --force-reinstall pymongo")
+
 
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def read_csv_rows(path: Path) -> Iterable[Dict[str, str]]:
+def detect_encoding(path: Path) -> str:
     """
-    Stream CSV rows as dicts with encoding fallback.
+    First of ENCODINGS that decodes the whole file, checked on raw bytes with an
+    incremental decoder so the CSV itself is only parsed once.
     """
-    last_err: Optional[Exception] = None
-    for enc in ENCODINGS:
-        try:
-            with path.open("r", newline="", encoding=enc, errors="strict") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    yield row
-            return
-        except UnicodeDecodeError as e:
-            last_err = e
-
-    # last resort: latin1 replace
-    with path.open("r", newline="", encoding="latin1", errors="replace") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            yield row
+    with path.open("rb") as f:
+        bom = f.read(3) == codecs.BOM_UTF8
+        for enc in ENCODINGS:
+            f.seek(0)
+            decoder = codecs.getincrementaldecoder(enc)()
+            try:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    decoder.decode(block)
+                decoder.decode(b"", final=True)
+                return "utf-8-sig" if enc == "utf-8" and bom else enc
+            except (UnicodeDecodeError, LookupError):
+                pass
+    return "latin1"
+
+
+def read_csv_rows(path: Path) -> Iterator[List[str]]:
+    """
+    Stream raw CSV rows (header first) using detect_encoding().
+    Lists from csv.reader avoid a per-row dict; see normalize_rows().
+    """
+    with path.open("r", newline="", encoding=detect_encoding(path), errors="replace") as f:
+        yield from csv.reader(f)
 
 
 def to_int(x: str) -> Optional[int]:
@@ -86,6 +106,25 @@ def to_date_mmddyyyy(x: str) -> Optional[datetime]:
     x = (x or "").strip()
     if not x:
         return None
+    return _parse_date(x)
+
+
+@lru_cache(maxsize=16384)
+def _parse_date(x: str) -> Optional[datetime]:
+    """
+    Dates repeat heavily across rows/columns; each distinct string is
+    parsed once (datetime is immutable, so sharing is safe).
+    The two expected layouts are sliced into ints directly; strptime is
+    only the fallback for anything else (e.g. non-padded 1/2/2016).
+    """
+    try:
+        if len(x) == 10 and x[2] == "/" and x[5] == "/" and x[:2].isdigit() and x[3:5].isdigit() and x[6:].isdigit():
+            return datetime(int(x[6:]), int(x[:2]), int(x[3:5]))
+        if len(x) == 10 and x[4] == "-" and x[7] == "-" and x[:4].isdigit() and x[5:7].isdigit() and x[8:].isdigit():
+            return datetime(int(x[:4]), int(x[5:7]), int(x[8:]))
+    except ValueError:
+        return None  # e.g. 02/30/2016
+
     for fmt in ("%m/%d/%Y", "%Y-%m-%d"):
         try:
             return datetime.strptime(x, fmt)
@@ -94,33 +133,56 @@ def to_date_mmddyyyy(x: str) -> Optional[datetime]:
     return None
 
 
-def normalize_row(row: Dict[str, str]) -> Dict:
+def _keep_str(x: str) -> Optional[str]:
+    return x or None
+
+
+# column -> parser; anything not listed is kept as a raw string
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "VAERS_ID": to_int,
+    "YEAR": to_int,
+    "AGE_YRS": to_float,
+    "NUMDAYS": to_float,
+    "VAX_DATE": to_date_mmddyyyy,
+    "ONSET_DATE": to_date_mmddyyyy,
+    "RECVDATE": to_date_mmddyyyy,
+    "RPT_DATE": to_date_mmddyyyy,
+    "DATEDIED": to_date_mmddyyyy,
+}
+
+
+def normalize_rows(rows: Iterable[List[str]]) -> Iterator[Dict]:
     """
-    Minimal normalization:
+    Minimal normalization of read_csv_rows() output (header first):
     - VAERS_ID as int
     - YEAR as int (if present)
     - Common numeric/date fields parsed when encountered
     Everything else stored as raw strings (fine for dev).
+    Keys and converters are resolved once per file, then applied by position.
     """
-    doc: Dict = {}
+    rows = iter(rows)
+    header = next(rows, None)
+    if not header:
+        return
 
-    for k, v in row.items():
-        if k is None:
-            continue
-        key = k.strip()
-        val = (v or "").strip()
-
-        if key == "VAERS_ID":
-            doc["VAERS_ID"] = to_int(val)
-        elif key == "YEAR":
-            doc["YEAR"] = to_int(val)
-        elif key in ("AGE_YRS", "NUMDAYS"):
-            doc[key] = to_float(val)
-        elif key in ("VAX_DATE", "ONSET_DATE", "RECVDATE", "RPT_DATE", "DATEDIED"):
-            doc[key] = to_date_mmddyyyy(val)
-        else:
-            doc[key] = val if val != "" else None
+    keys = [h.strip() for h in header]
+    convs = [_CONVERTERS.get(k, _keep_str) for k in keys]
+    n = len(keys)
+
+    for row in rows:
+        if not row:
+            continue  # blank line
+        if len(row) < n:
+            row = row + [""] * (n - len(row))
+        yield {k: conv(v.strip()) for k, conv, v in zip(keys, convs, row)}
 
+
+def add_symptoms_array(doc: Dict) -> Dict:
+    """
+    Merge SYMPTOM1-5 into a deduped SYMPTOMS array (nulls dropped).
+    A single multikey index on it replaces five per-column indexes.
+    """
+    doc["SYMPTOMS"] = list(dict.fromkeys(doc[f] for f in SYMPTOM_FIELDS if doc.get(f)))
     return doc
 
 
@@ -129,14 +191,27 @@ def bulk_upsert(
     docs: Iterable[Dict],
     key_fields=("VAERS_ID",),
     batch_size: int = 2000,
+    mode: str = "upsert",
 ) -> int:
     """
     Upsert docs in batches by compound key_fields.
+    mode="insert" is for freshly dropped collections: plain unordered
+    insert_many (no per-doc query phase). Repeated keys are merged the way
+    the upsert path's $set would (later rows overwrite earlier fields): within
+    a batch in memory, and for keys already inserted by an earlier batch via
+    a follow-up $set update.
     Returns total operations executed.
     """
+    if mode == "insert":
+        return _bulk_insert_last_wins(coll, docs, key_fields, batch_size)
+
     ops = []
     total = 0
 
+    def flush() -> int:
+        res = coll.bulk_write(ops, ordered=False)
+        return res.inserted_count + res.modified_count + res.upserted_count
+
     for d in docs:
         # build filter by key_fields
         filt = {k: d.get(k) for k in key_fields}
@@ -146,14 +221,59 @@ def bulk_upsert(
         ops.append(UpdateOne(filt, {"$set": d}, upsert=True))
 
         if len(ops) >= batch_size:
-            res = coll.bulk_write(ops, ordered=False)
-            total += res.inserted_count + res.modified_count + res.upserted_count
+            total += flush()
             ops = []
 
     if ops:
-        res = coll.bulk_write(ops, ordered=False)
-        total += res.inserted_count + res.modified_count + res.upserted_count
+        total += flush()
+
+    return total
+
+
+def _bulk_insert_last_wins(
+    coll: Collection,
+    docs: Iterable[Dict],
+    key_fields,
+    batch_size: int,
+) -> int:
+    """
+    bulk_upsert(mode="insert"): one insert_many per batch of distinct keys.
+    """
+    total = 0
+    inserted = set()             # keys written by earlier batches
+    pending: Dict[tuple, Dict] = {}  # this batch, key -> merged doc
+    late: List[UpdateOne] = []   # repeats of already-inserted keys, in row order
+
+    def flush() -> int:
+        n = 0
+        if pending:
+            n += len(coll.insert_many(list(pending.values()), ordered=False,
+                                      bypass_document_validation=True).inserted_ids)
+            inserted.update(pending)
+            pending.clear()
+        if late:
+            # ordered: several repeats of one key must apply in row order
+            n += coll.bulk_write(late, ordered=True).modified_count
+            late.clear()
+        return n
+
+    for d in docs:
+        filt = {k: d.get(k) for k in key_fields}
+        if any(v is None for v in filt.values()):
+            continue
+
+        key = tuple(filt.values())
+        if key in inserted:
+            late.append(UpdateOne(filt, {"$set": d}))
+        elif key in pending:
+            pending[key].update(d)
+        else:
+            pending[key] = d
 
+        if len(pending) + len(late) >= batch_size:
+            total += flush()
+
+    total += flush()
     return total
 
 
@@ -169,59 +289,70 @@ def main():
     c_vax  = db["vaers_vax"]
     c_sym  = db["vaers_symptoms"]
 
-    # Optional: reset collections for clean dev runs
+    # Optional: reset collections for clean dev runs (the loads below use mode="insert")
     for c in (c_data, c_vax, c_sym):
         c.drop()
 
     print(f"[INFO] Loading into DB='{MONGO_DB}' at {MONGO_URI}")
- 
-    # DATA: one row per report (VAERS_ID)
-    print(f"[INFO] Loading {CSV_DATA.name} -> vaers_data")
-    data_docs = (normalize_row(r) for r in read_csv_rows(CSV_DATA))
-    n1 = bulk_upsert(c_data, data_docs, key_fields=("VAERS_ID",), batch_size=2000)
-    print(f"[OK] vaers_data upserts: {n1:,}")
-    
-    # SYMPTOMS: multiple rows per VAERS_ID; each row contains SYMPTOM1-5; practical key includes those fields
-    print(f"[INFO] Loading {CSV_SYM.name} -> vaers_symptoms")
-    sym_docs = (normalize_row(r) for r in read_csv_rows(CSV_SYM))
-    n3 = bulk_upsert(c_sym, sym_docs, key_fields=("VAERS_ID", "SYMPTOM1", "SYMPTOM2", "SYMPTOM3", "SYMPTOM4", "SYMPTOM5"), batch_size=3000)
-    print(f"[OK] vaers_symptoms upserts: {n3:,}")
-    
-
-    # VAX: multiple rows per VAERS_ID; use (VAERS_ID, VAX_TYPE, VAX_MANU, VAX_NAME, VAX_LOT) as a practical key
-    # (VAERS doesn’t provide an explicit row id; this is fine for dev.)
-    print(f"[INFO] Loading {CSV_VAX.name} -> vaers_vax")
-    vax_docs = (normalize_row(r) for r in read_csv_rows(CSV_VAX))
-    n2 = bulk_upsert(c_vax, vax_docs, key_fields=("VAERS_ID", "VAX_TYPE", "VAX_MANU", "VAX_NAME", "VAX_LOT"), batch_size=3000)
-    print(f"[OK] vaers_vax upserts: {n2:,}")
-
-    
+
+    # The three files/collections are independent: load them concurrently so one
+    # collection's network round-trips overlap with another's CSV parsing.
+    loads = [
+        # DATA: one row per report (VAERS_ID)
+        (CSV_DATA, c_data, normalize_rows(read_csv_rows(CSV_DATA)),
+         ("VAERS_ID",)),
+        # SYMPTOMS: multiple rows per VAERS_ID; each row contains SYMPTOM1-5; practical key includes those fields
+        (CSV_SYM, c_sym, (add_symptoms_array(d) for d in normalize_rows(read_csv_rows(CSV_SYM))),
+         ("VAERS_ID", "SYMPTOM1", "SYMPTOM2", "SYMPTOM3", "SYMPTOM4", "SYMPTOM5")),
+        # VAX: multiple rows per VAERS_ID; use (VAERS_ID, VAX_TYPE, VAX_MANU, VAX_NAME, VAX_LOT) as a practical key
+        # (VAERS doesn’t provide an explicit row id; this is fine for dev.)
+        (CSV_VAX, c_vax, normalize_rows(read_csv_rows(CSV_VAX)),
+         ("VAERS_ID", "VAX_TYPE", "VAX_MANU", "VAX_NAME", "VAX_LOT")),
+    ]
+    for path, coll, _, _ in loads:
+        print(f"[INFO] Loading {path.name} -> {coll.name}")
+
+    with ThreadPoolExecutor(max_workers=len(loads)) as pool:
+        futures = [
+            (coll, pool.submit(bulk_upsert, coll, docs, key_fields=keys, batch_size=BATCH_SIZE, mode="insert"))
+            for _, coll, docs, keys in loads
+        ]
+        for coll, fut in futures:
+            print(f"[OK] {coll.name} inserts: {fut.result():,}")
 
     # Indexes (dev-friendly)
+    # One createIndexes round-trip per collection; the three collections build concurrently.
     print("[INFO] Creating indexes...")
-    
-    c_data.create_index([("VAERS_ID", 1)], unique=True)
-    c_data.create_index([("YEAR", 1)])
-    c_data.create_index([("STATE", 1)])
-    c_data.create_index([("SEX", 1)])
-    c_data.create_index([("AGE_YRS", 1)])
-    c_data.create_index([("ONSET_DATE", 1)])
-    c_data.create_index([("RECVDATE", 1)])
-
-    c_sym.create_index([("VAERS_ID", 1)])
-    c_sym.create_index([("YEAR", 1)])
-    c_sym.create_index([("SYMPTOM1", 1)])
-    #c_sym.create_index([("SYMPTOM_TEXT", "text")])  # optional (can be heavy)
-    
-
-    c_vax.create_index([("VAERS_ID", 1)])
-    c_vax.create_index([("YEAR", 1)])
-    c_vax.create_index([("VAX_TYPE", 1)])
-    c_vax.create_index([("VAX_MANU", 1)])
-    c_vax.create_index([("VAX_DOSE_SERIES", 1)])
-    c_vax.create_index([("VAX_DATE", 1)])
-
-    
+
+    index_specs = {
+        c_data: [
+            IndexModel([("VAERS_ID", 1)], unique=True),
+            IndexModel([("YEAR", 1)]),
+            IndexModel([("STATE", 1)]),
+            IndexModel([("SEX", 1)]),
+            IndexModel([("AGE_YRS", 1)]),
+            IndexModel([("ONSET_DATE", 1)]),
+            IndexModel([("RECVDATE", 1)]),
+        ],
+        c_sym: [
+            IndexModel([("VAERS_ID", 1)]),
+            IndexModel([("YEAR", 1)]),
+            IndexModel([("SYMPTOMS", 1)]),
+            #IndexModel([("SYMPTOM_TEXT", "text")]),  # optional (can be heavy); keep last
+        ],
+        c_vax: [
+            IndexModel([("VAERS_ID", 1)]),
+            IndexModel([("YEAR", 1)]),
+            IndexModel([("VAX_TYPE", 1)]),
+            IndexModel([("VAX_MANU", 1)]),
+            IndexModel([("VAX_DOSE_SERIES", 1)]),
+            IndexModel([("VAX_DATE", 1)]),
+        ],
+    }
+    with ThreadPoolExecutor(max_workers=len(index_specs)) as pool:
+        futures = [pool.submit(c.create_indexes, models) for c, models in index_specs.items()]
+        for fut in futures:
+            fut.result()
 
     print("[OK] Done. Quick counts:")
     print("  vaers_data     =", c_data.estimated_document_count())
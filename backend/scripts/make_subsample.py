@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import codecs
+import csv
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 
 
 # ----------------------------
@@ -38,38 +46,34 @@ SERIOUS_FLAG_COLS = ["DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT"]
 # Robust CSV reader (encoding fallback)
 # ----------------------------
 
-def _read_csv_retry(path: Path, *, preferred_encoding: str = "", **kwargs):
+@lru_cache(maxsize=None)
+def _detect_encoding(path: Path, preferred_encoding: str = "") -> str:
     """
-    Pandas read_csv with encoding fallback, to avoid UnicodeDecodeError on VAERS files.
+    Pick an encoding for a VAERS file once; every reader of that path reuses it.
     - If preferred_encoding is set (e.g., from .env), try it first.
-    - Then try common fallbacks: utf-8, utf-8-sig, cp1252, latin1.
+    - Then try common fallbacks: utf-8 (utf-8-sig if BOM), cp1252, latin1.
+    The check streams raw bytes through an incremental decoder (no CSV parsing),
+    so a stray cp1252 byte deep in the file is still caught, unlike a prefix sniff.
     """
-    tried: list[str] = []
-    encodings = []
-    if preferred_encoding:
-        encodings.append(preferred_encoding)
-
-    for e in ["utf-8", "utf-8-sig", "cp1252", "latin1"]:
+    encodings = [preferred_encoding] if preferred_encoding else []
+    for e in ["utf-8", "cp1252", "latin1"]:
         if e not in encodings:
             encodings.append(e)
 
-    last_err = None
-    for enc in encodings:
-        try:
-            return pd.read_csv(path, encoding=enc, **kwargs)
-        except UnicodeDecodeError as e:
-            tried.append(enc)
-            last_err = e
-
-    # Last resort: latin1 with replacement (if pandas supports encoding_errors)
-    try:
-        return pd.read_csv(path, encoding="latin1", encoding_errors="replace", **kwargs)
-    except TypeError:
-        # older pandas without encoding_errors
-        raise UnicodeDecodeError(
-            "utf-8", b"", 0, 1,
-            f"Failed decoding {path.name}. Tried: {tried}. Last error: {last_err}"
-        )
+    with path.open("rb") as f:
+        bom = f.read(3) == codecs.BOM_UTF8
+        for enc in encodings:
+            f.seek(0)
+            decoder = codecs.getincrementaldecoder(enc)()
+            try:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    decoder.decode(block)
+                decoder.decode(b"", final=True)
+            except (UnicodeDecodeError, LookupError):
+                continue
+            return "utf-8-sig" if enc == "utf-8" and bom else enc
+
+    return "latin1"  # unreachable: latin1 decodes any byte
 
 
 # ----------------------------
@@ -84,12 +88,110 @@ def year_file(year: int, kind: str) -> Path:
     return p
 
 
+@lru_cache(maxsize=256)
+def _read_header(csv_path: Path, csv_encoding: str) -> Tuple[str, ...]:
+    """
+    First CSV record only; cached because sampling, top-up and filtering
+    all ask for the same headers.
+    """
+    enc = _detect_encoding(csv_path, csv_encoding)
+    with csv_path.open("r", newline="", encoding=enc, errors="replace") as f:
+        return tuple(next(csv.reader(f), []))
+
+
 def existing_columns(csv_path: Path, csv_encoding: str) -> Set[str]:
-    return set(_read_csv_retry(csv_path, preferred_encoding=csv_encoding, nrows=0).columns)
+    return set(_read_header(csv_path, csv_encoding))
 
 
-def coerce_int(series: pd.Series) -> pd.Series:
-    return pd.to_numeric(series, errors="coerce")
+def csv_header(csv_path: Path, csv_encoding: str) -> List[str]:
+    """
+    Column names in file order (first line only).
+    """
+    return list(_read_header(csv_path, csv_encoding))
+
+
+# ----------------------------
+# Arrow streaming reader
+# ----------------------------
+
+def _open_arrow_csv(
+    path: Path,
+    columns: Optional[List[str]],
+    chunksize: int,
+    csv_encoding: str = "",
+    dictionary_columns: Iterable[str] = (),
+    block_size: Optional[int] = None,
+) -> pacsv.CSVStreamingReader:
+    """
+    Stream a CSV as Arrow record batches (multithreaded C++ tokenizer).
+    - Only `columns` are materialized (all columns if None).
+    - Every column is read as a string so values are written back unchanged;
+      VAERS_ID is parsed separately via _parse_ids().
+    - dictionary_columns (low-cardinality flags) are dictionary-encoded instead.
+    - block_size approximates `chunksize` rows (~128 bytes/row) unless given.
+    - Quoted cells may span lines (SYMPTOM_TEXT, LAB_DATA, HISTORY), so the
+      chunker must not split blocks at raw newlines.
+    """
+    names = columns if columns is not None else csv_header(path, csv_encoding)
+    enc = _detect_encoding(path, csv_encoding)
+    column_types = {c: pa.string() for c in names}
+    column_types.update({c: pa.dictionary(pa.int32(), pa.string()) for c in dictionary_columns})
+    return pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(
+            block_size=block_size or max(1 << 20, chunksize * 128),
+            use_threads=True,
+            encoding="utf8" if enc in ("utf-8", "utf-8-sig") else enc,  # utf8 is native (BOM skipped)
+        ),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=names,
+            column_types=column_types,
+        ),
+    )
+
+
+def _parse_ids(col: pa.Array) -> pa.Array:
+    """
+    VAERS_ID string column -> int64 column of the same length.
+    Blank / malformed IDs become null (no float64 round-trip).
+    """
+    col = pc.utf8_trim_whitespace(col)
+    return pc.cast(pc.if_else(pc.match_substring_regex(col, r"^\d+$"), col, None), pa.int64())
+
+
+def _dict_eq(col: pa.DictionaryArray, value: str) -> pa.BooleanArray:
+    """
+    col == value on a dictionary-encoded column: one int32 compare on the indices.
+    """
+    code = pc.index(col.dictionary, value).as_py()
+    if code < 0:
+        return pa.array(np.zeros(len(col), dtype=bool))
+    return pc.fill_null(pc.equal(col.indices, code), False)
+
+
+def id_value_set(ids_set: Set[int]) -> pa.Array:
+    """
+    Arrow lookup set for pc.is_in; build once per year and reuse for DATA/VAX/SYM.
+    """
+    return pa.array(sorted(ids_set), type=pa.int64())
+
+
+def _build_id_lookup(ids_set: Set[int]) -> np.ndarray:
+    """
+    Sorted int64 array for _isin_sorted(); build once, reuse across chunks.
+    """
+    return np.sort(np.fromiter(ids_set, dtype=np.int64, count=len(ids_set)))
+
+
+def _isin_sorted(ids_arr: np.ndarray, ids_sorted: np.ndarray) -> np.ndarray:
+    """
+    Vectorized membership test via binary search (no per-chunk hash build).
+    """
+    if ids_sorted.size == 0:
+        return np.zeros(ids_arr.shape, dtype=bool)
+    idx = np.searchsorted(ids_sorted, ids_arr)
+    return ids_sorted[idx.clip(max=ids_sorted.size - 1)] == ids_arr
 
 
 # ----------------------------
@@ -108,6 +210,9 @@ def sample_ids_stream_random_keys(
     Stream sample k VAERS_IDs from VAERSDATA using the "random key" method:
       assign each row a random U~(0,1), keep k rows with smallest U.
     Uniform without replacement (practically), streaming + memory-safe.
+
+    The reservoir never grows past k: once full, only rows whose key beats
+    the current k-th smallest key are merged in (memory O(k + batch)).
     """
     if k <= 0:
         return set()
@@ -124,40 +229,44 @@ def sample_ids_stream_random_keys(
 
     res_keys = np.empty(0, dtype=np.float64)
     res_ids = np.empty(0, dtype=np.int64)
+    scratch = np.empty(0, dtype=np.float64)  # reused per batch for the random keys
 
-    reader = _read_csv_retry(
-        data_csv,
-        preferred_encoding=csv_encoding,
-        usecols=usecols,
-        chunksize=chunksize,
-        low_memory=False,
+    reader = _open_arrow_csv(
+        data_csv, usecols, chunksize, csv_encoding,
+        dictionary_columns=available_serious if serious_only else (),
     )
 
-    for chunk in reader:
-        ids = coerce_int(chunk["VAERS_ID"])
-        mask = ids.notna()
-
+    for batch in reader:
         if serious_only:
-            ser = pd.Series(False, index=chunk.index)
-            for c in available_serious:
-                ser = ser | (chunk[c] == "Y")
-            mask = mask & ser
+            col = batch.column("VAERS_ID")
+            ser = _dict_eq(batch.column(available_serious[0]), "Y")
+            for c in available_serious[1:]:
+                ser = pc.or_(ser, _dict_eq(batch.column(c), "Y"))
+            col = pc.filter(col, ser)
+        else:
+            col = batch.column("VAERS_ID")
 
-        if not mask.any():
+        ids = pc.drop_null(_parse_ids(col))
+        if len(ids) == 0:
             continue
 
-        ids_arr = ids.loc[mask].astype("int64").to_numpy()
-        if ids_arr.size == 0:
-            continue
+        ids_arr = ids.to_numpy()
 
-        keys_arr = rng.random(ids_arr.size)
+        n = ids_arr.size
+        if n > scratch.size:
+            scratch = np.empty(n, dtype=np.float64)
+        keys_arr = rng.random(out=scratch[:n])  # same stream as rng.random(n)
 
-        if res_ids.size == 0:
-            res_ids, res_keys = ids_arr, keys_arr
-        else:
-            res_ids = np.concatenate([res_ids, ids_arr])
-            res_keys = np.concatenate([res_keys, keys_arr])
+        if res_ids.size == k:
+            # 1. reservoir full -> only keys below the current max can enter
+            cand = keys_arr < res_keys.max()
+            if not cand.any():
+                continue
+            ids_arr, keys_arr = ids_arr[cand], keys_arr[cand]
 
+        # 2. merge (bounded by k + batch; copies out of scratch) and trim back to the k smallest keys
+        res_ids = np.concatenate([res_ids, ids_arr])
+        res_keys = np.concatenate([res_keys, keys_arr])
         if res_ids.size > k:
             idx = np.argpartition(res_keys, k - 1)[:k]
             res_ids = res_ids[idx]
@@ -197,6 +306,18 @@ def sample_ids_for_year(
 # Optional top-up by VAX_TYPE for better UI demos
 # ----------------------------
 
+def _id_keys(ids: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Deterministic pseudo-random key in [0, 1) per VAERS_ID (splitmix64 finalizer).
+    The same ID always gets the same key, so repeated rows never double-count.
+    """
+    z = ids.astype(np.uint64) + np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
 def topup_ids_by_vax_type(
     vax_csv: Path,
     ids_set: Set[int],
@@ -206,6 +327,13 @@ def topup_ids_by_vax_type(
     chunksize: int,
     csv_encoding: str,
 ) -> Set[int]:
+    """
+    Single pass over VAERSVAX:
+      - have[t]: sampled IDs already carrying vax type t
+      - reservoir[t]: uniform sample (k smallest _id_keys) of up to
+        min_per_vax_type distinct unsampled IDs with type t
+    Types short of min_per_vax_type are then topped up from their reservoir.
+    """
     ensure_vax_types = [t.strip() for t in ensure_vax_types if t.strip()]
     if not ensure_vax_types or min_per_vax_type <= 0:
         return ids_set
@@ -214,62 +342,44 @@ def topup_ids_by_vax_type(
     if "VAERS_ID" not in cols or "VAX_TYPE" not in cols:
         return ids_set
 
+    k = min_per_vax_type
     have = {t: set() for t in ensure_vax_types}
+    reservoir = {t: np.empty(0, dtype=np.int64) for t in ensure_vax_types}
+    ids_sorted = _build_id_lookup(ids_set)
 
-    reader1 = _read_csv_retry(
-        vax_csv,
-        preferred_encoding=csv_encoding,
-        usecols=["VAERS_ID", "VAX_TYPE"],
-        chunksize=chunksize,
-        low_memory=False,
+    reader = _open_arrow_csv(
+        vax_csv, ["VAERS_ID", "VAX_TYPE"], chunksize, csv_encoding,
+        dictionary_columns=["VAX_TYPE"],
     )
-    for chunk in reader1:
-        ids = coerce_int(chunk["VAERS_ID"])
-        chunk = chunk.loc[ids.notna(), ["VAX_TYPE"]].copy()
-        chunk.insert(0, "VAERS_ID", ids.loc[ids.notna()].astype("int64").to_numpy())
-
-        in_set = chunk[chunk["VAERS_ID"].isin(ids_set)]
-        if in_set.empty:
+    for batch in reader:
+        ids = _parse_ids(batch.column("VAERS_ID"))
+        ok = pc.is_valid(ids)
+        id_arr = pc.filter(ids, ok).to_numpy()
+        types = pc.filter(batch.column("VAX_TYPE"), ok)
+        if id_arr.size == 0:
             continue
 
-        for t in ensure_vax_types:
-            have[t].update(in_set.loc[in_set["VAX_TYPE"] == t, "VAERS_ID"].unique().tolist())
-
-    need = {t: max(0, min_per_vax_type - len(have[t])) for t in ensure_vax_types}
-    if all(v == 0 for v in need.values()):
-        return ids_set
-
-    candidates = {t: set() for t in ensure_vax_types}
-    reader2 = _read_csv_retry(
-        vax_csv,
-        preferred_encoding=csv_encoding,
-        usecols=["VAERS_ID", "VAX_TYPE"],
-        chunksize=chunksize,
-        low_memory=False,
-    )
-    for chunk in reader2:
-        ids = coerce_int(chunk["VAERS_ID"])
-        chunk = chunk.loc[ids.notna(), ["VAX_TYPE"]].copy()
-        chunk.insert(0, "VAERS_ID", ids.loc[ids.notna()].astype("int64").to_numpy())
-
-        not_in = chunk[~chunk["VAERS_ID"].isin(ids_set)]
-        if not_in.empty:
-            continue
+        in_set = _isin_sorted(id_arr, ids_sorted)
 
         for t in ensure_vax_types:
-            if need[t] <= 0:
+            is_t = _dict_eq(types, t).to_numpy(zero_copy_only=False)
+            have[t].update(id_arr[is_t & in_set].tolist())
+
+            cand = id_arr[is_t & ~in_set]
+            if cand.size == 0:
                 continue
-            candidates[t].update(not_in.loc[not_in["VAX_TYPE"] == t, "VAERS_ID"].unique().tolist())
+            pool = np.union1d(reservoir[t], cand)  # distinct IDs
+            if pool.size > k:
+                pool = pool[np.argpartition(_id_keys(pool, seed), k - 1)[:k]]
+            reservoir[t] = pool
 
     rng = np.random.default_rng(seed)
     for t in ensure_vax_types:
-        if need[t] <= 0:
-            continue
-        cand = sorted(candidates[t])
-        if not cand:
+        need = max(0, min_per_vax_type - len(have[t]))
+        cand = np.sort(reservoir[t])
+        if need <= 0 or cand.size == 0:
             continue
-        take = min(need[t], len(cand))
-        pick = rng.choice(np.array(cand, dtype=np.int64), size=take, replace=False)
+        pick = rng.choice(cand, size=min(need, cand.size), replace=False)
         ids_set.update(int(x) for x in pick.tolist())
 
     return ids_set
@@ -279,45 +389,101 @@ def topup_ids_by_vax_type(
 # Stream filter writers
 # ----------------------------
 
+class CsvAppender:
+    """
+    Append Arrow tables to one CSV through a single pyarrow CSVWriter.
+    The first table fixes the column layout; later tables (e.g. another year
+    whose raw file adds/drops columns) are projected onto it: missing columns
+    are written blank, extra ones are dropped with a warning.
+    """
+
+    def __init__(self, path: Path, write_header: bool = True):
+        self.path = path
+        self.write_header = write_header and not path.exists()
+        self.schema: Optional[pa.Schema] = None
+        self._sink = None
+        self._writer: Optional[pacsv.CSVWriter] = None
+        self._warned: Set[str] = set()
+
+    def _conform(self, table: pa.Table) -> pa.Table:
+        if table.schema.equals(self.schema):
+            return table
+        extra = [c for c in table.column_names if self.schema.get_field_index(c) < 0 and c not in self._warned]
+        if extra:
+            print(f"[WARN] {self.path.name}: dropping columns not in first header: {extra}")
+            self._warned.update(extra)
+        cols = [
+            table.column(f.name).cast(f.type) if f.name in table.column_names else pa.nulls(table.num_rows, f.type)
+            for f in self.schema
+        ]
+        return pa.Table.from_arrays(cols, schema=self.schema)
+
+    def write(self, table: pa.Table) -> None:
+        if self._writer is None:
+            self.schema = table.schema
+            self._sink = self.path.open("ab")
+            self._writer = pacsv.CSVWriter(
+                self._sink,
+                self.schema,
+                write_options=pacsv.WriteOptions(include_header=self.write_header),
+            )
+        self._writer.write_table(self._conform(table))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self) -> "CsvAppender":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def filter_csv_by_ids(
     in_csv: Path,
-    out_csv: Path,
-    ids_set: Set[int],
+    out_csv: Union[Path, CsvAppender],
+    ids_set: Union[Set[int], pa.Array],
     chunksize: int,
     add_year: Optional[int] = None,
     write_header: bool = True,
     csv_encoding: str = "",
 ) -> int:
-    rows_written = 0
-    mode = "a" if out_csv.exists() else "w"
-    first_write = not out_csv.exists()
-
-    reader = _read_csv_retry(
-        in_csv,
-        preferred_encoding=csv_encoding,
-        chunksize=chunksize,
-        low_memory=False,
-    )
+    """
+    Stream in_csv and append rows whose VAERS_ID is in ids_set to out_csv.
+    Parsing, the membership test (hash lookup) and CSV writing all run in Arrow;
+    ids_set may be a prebuilt id_value_set() to skip rebuilding the lookup, and
+    out_csv an open CsvAppender shared across years (a Path gets its own).
+    """
+    if not isinstance(out_csv, CsvAppender):
+        with CsvAppender(out_csv, write_header=write_header) as out:
+            return filter_csv_by_ids(in_csv, out, ids_set, chunksize, add_year, write_header, csv_encoding)
 
-    for chunk in reader:
-        if "VAERS_ID" not in chunk.columns:
-            continue
+    header = csv_header(in_csv, csv_encoding)
+    if "VAERS_ID" not in header:
+        return 0
 
-        ids = coerce_int(chunk["VAERS_ID"])
-        kept = chunk.loc[ids.notna()].copy()
-        kept["VAERS_ID"] = ids.loc[ids.notna()].astype("int64").to_numpy()
+    rows_written = 0
+    value_set = ids_set if isinstance(ids_set, pa.Array) else id_value_set(ids_set)
 
-        kept = kept[kept["VAERS_ID"].isin(ids_set)]
-        if kept.empty:
+    for batch in _open_arrow_csv(in_csv, header, chunksize, csv_encoding):
+        ids = _parse_ids(batch.column("VAERS_ID"))
+        keep = pc.is_in(ids, value_set=value_set)  # null (bad ID) -> False
+        if not pc.any(keep).as_py():
             continue
 
-        if add_year is not None and "YEAR" not in kept.columns:
-            kept.insert(0, "YEAR", int(add_year))
+        kept = pa.Table.from_batches([batch]).filter(keep)
+        kept = kept.set_column(kept.schema.get_field_index("VAERS_ID"), "VAERS_ID", ids.filter(keep))
 
-        kept.to_csv(out_csv, index=False, mode=mode, header=(write_header and first_write))
-        mode = "a"
-        first_write = False
-        rows_written += len(kept)
+        if add_year is not None and "YEAR" not in kept.column_names:
+            kept = kept.add_column(0, "YEAR", pa.repeat(pa.scalar(int(add_year)), kept.num_rows))
+
+        out_csv.write(kept)
+        rows_written += kept.num_rows
 
     return rows_written
 
@@ -326,70 +492,127 @@ def filter_csv_by_ids(
 # Run
 # ----------------------------
 
+KINDS = ("VAERSDATA", "VAERSVAX", "VAERSSYMPTOMS")
+STAGE_DIRNAME = "_stage"
+
+
+def stage_file(prefix: str, year: int, kind: str) -> Path:
+    # per-year staging output, merged into the combined file by merge_stage_files
+    return OUT_DIR / STAGE_DIRNAME / f"{prefix}{year}_{kind}.csv"
+
+
+def process_year(year: int, cfg: Dict) -> Tuple[int, int, int, int]:
+    """
+    Sample, top up and filter one year. Years share no state, so this runs
+    in a worker process; outputs go to per-year files (stage files if combining).
+    Returns (n_ids, rows_data, rows_vax, rows_sym).
+    """
+    chunksize = cfg["chunksize"]
+    csv_encoding = cfg.get("csv_encoding", "")
+    combine = cfg["combine"]
+    prefix = cfg["prefix"]
+
+    ids = sample_ids_for_year(
+        data_csv=year_file(year, "VAERSDATA"),
+        n_random=cfg["n_random_per_year"],
+        n_serious=cfg["n_serious_per_year"],
+        seed=42 + year,
+        chunksize=chunksize,
+        csv_encoding=csv_encoding,
+    )
+
+    if cfg["ensure_vax_types"] and cfg["min_per_vax_type"] > 0:
+        ids = topup_ids_by_vax_type(
+            vax_csv=year_file(year, "VAERSVAX"),
+            ids_set=ids,
+            ensure_vax_types=cfg["ensure_vax_types"],
+            min_per_vax_type=cfg["min_per_vax_type"],
+            seed=4242 + year,
+            chunksize=chunksize,
+            csv_encoding=csv_encoding,
+        )
+
+    id_values = id_value_set(ids)
+
+    rows = []
+    for kind in KINDS:
+        out = stage_file(prefix, year, kind) if combine else OUT_DIR / f"{prefix}{year}{kind}.csv"
+        if out.exists():
+            out.unlink()
+        rows.append(filter_csv_by_ids(
+            year_file(year, kind), out, id_values, chunksize,
+            add_year=year if combine else None, write_header=True, csv_encoding=csv_encoding,
+        ))
+
+    return len(ids), rows[0], rows[1], rows[2]
+
+
+def merge_stage_files(stages: List[Path], out_csv: Path, chunksize: int) -> None:
+    """
+    Concatenate per-year stage CSVs into out_csv, then delete them.
+    Same header everywhere -> raw byte append (later headers skipped, no re-parse);
+    otherwise rows are re-read and projected onto the first header via CsvAppender.
+    """
+    stages = [p for p in stages if p.exists()]
+    headers = set()
+    for p in stages:
+        with p.open("rb") as f:
+            headers.add(f.readline())
+
+    if len(headers) <= 1:
+        with out_csv.open("wb") as out:
+            for i, p in enumerate(stages):
+                with p.open("rb") as f:
+                    if i:
+                        f.readline()
+                    shutil.copyfileobj(f, out, 1 << 20)
+    else:
+        with CsvAppender(out_csv) as out:
+            for p in stages:
+                for batch in _open_arrow_csv(p, None, chunksize, "utf-8"):
+                    out.write(pa.Table.from_batches([batch]))
+
+    for p in stages:
+        p.unlink()
+
+
 def main() -> None:
     years = SUBSAMPLE["years"]
-    n_random = SUBSAMPLE["n_random_per_year"]
-    n_serious = SUBSAMPLE["n_serious_per_year"]
     combine = SUBSAMPLE["combine"]
     prefix = SUBSAMPLE["prefix"]
-    chunksize = SUBSAMPLE["chunksize"]
-    ensure_types = SUBSAMPLE["ensure_vax_types"]
-    min_per_type = SUBSAMPLE["min_per_vax_type"]
-    csv_encoding = SUBSAMPLE.get("csv_encoding", "")
+    cfg = dict(SUBSAMPLE, csv_encoding=SUBSAMPLE.get("csv_encoding", ""))
 
+    stage_dir = OUT_DIR / STAGE_DIRNAME
     if combine:
-        out_data = OUT_DIR / f"{prefix}VAERSDATA.csv"
-        out_vax = OUT_DIR / f"{prefix}VAERSVAX.csv"
-        out_sym = OUT_DIR / f"{prefix}VAERSSYMPTOMS.csv"
-        for p in (out_data, out_vax, out_sym):
+        for kind in KINDS:
+            p = OUT_DIR / f"{prefix}{kind}.csv"
             if p.exists():
                 p.unlink()
+        # leftovers from an interrupted run would otherwise be appended to
+        shutil.rmtree(stage_dir, ignore_errors=True)
+        stage_dir.mkdir(parents=True)
+
+    # CSV parsing is CPU-bound and years are independent -> one process per year
+    workers = min(len(years), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(process_year, years, [cfg] * len(years)))
+    else:
+        results = [process_year(year, cfg) for year in years]
 
     summary = []
+    for year, (n_ids, rows_d, rows_v, rows_s) in zip(years, results):
+        summary.append((year, n_ids, rows_d, rows_v, rows_s))
+        print(f"[OK] {year}: IDs={n_ids:,} | DATA={rows_d:,} VAX={rows_v:,} SYM={rows_s:,}")
 
-    for year in years:
-        data_csv = year_file(year, "VAERSDATA")
-        vax_csv = year_file(year, "VAERSVAX")
-        sym_csv = year_file(year, "VAERSSYMPTOMS")
-
-        ids = sample_ids_for_year(
-            data_csv=data_csv,
-            n_random=n_random,
-            n_serious=n_serious,
-            seed=42 + year,
-            chunksize=chunksize,
-            csv_encoding=csv_encoding,
-        )
-
-        if ensure_types and min_per_type > 0:
-            ids = topup_ids_by_vax_type(
-                vax_csv=vax_csv,
-                ids_set=ids,
-                ensure_vax_types=ensure_types,
-                min_per_vax_type=min_per_type,
-                seed=4242 + year,
-                chunksize=chunksize,
-                csv_encoding=csv_encoding,
+    if combine:
+        for kind in KINDS:
+            merge_stage_files(
+                [stage_file(prefix, year, kind) for year in years],
+                OUT_DIR / f"{prefix}{kind}.csv",
+                SUBSAMPLE["chunksize"],
             )
-
-        if combine:
-            rows_d = filter_csv_by_ids(data_csv, out_data, ids, chunksize, add_year=year, write_header=True, csv_encoding=csv_encoding)
-            rows_v = filter_csv_by_ids(vax_csv, out_vax, ids, chunksize, add_year=year, write_header=True, csv_encoding=csv_encoding)
-            rows_s = filter_csv_by_ids(sym_csv, out_sym, ids, chunksize, add_year=year, write_header=True, csv_encoding=csv_encoding)
-        else:
-            y_data = OUT_DIR / f"{prefix}{year}VAERSDATA.csv"
-            y_vax = OUT_DIR / f"{prefix}{year}VAERSVAX.csv"
-            y_sym = OUT_DIR / f"{prefix}{year}VAERSSYMPTOMS.csv"
-            for p in (y_data, y_vax, y_sym):
-                if p.exists():
-                    p.unlink()
-
-            rows_d = filter_csv_by_ids(data_csv, y_data, ids, chunksize, add_year=None, write_header=True, csv_encoding=csv_encoding)
-            rows_v = filter_csv_by_ids(vax_csv, y_vax, ids, chunksize, add_year=None, write_header=True, csv_encoding=csv_encoding)
-            rows_s = filter_csv_by_ids(sym_csv, y_sym, ids, chunksize, add_year=None, write_header=True, csv_encoding=csv_encoding)
-
-        summary.append((year, len(ids), rows_d, rows_v, rows_s))
-        print(f"[OK] {year}: IDs={len(ids):,} | DATA={rows_d:,} VAX={rows_v:,} SYM={rows_s:,}")
+        stage_dir.rmdir()
 
     print("\n=== Summary ===")
     for year, n_ids, rd, rv, rs in summary:
@@ -401,6 +624,5 @@ def main() -> None:
         print(f"  - {(OUT_DIR / f'{prefix}VAERSVAX.csv').relative_to(ROOT)}")
         print(f"  - {(OUT_DIR / f'{prefix}VAERSSYMPTOMS.csv').relative_to(ROOT)}")
 
-
 if __name__ == "__main__":
     main()
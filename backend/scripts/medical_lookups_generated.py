@@ -0,0 +1,300 @@
+"""
+AUTO-GENERATED by generate_lookups.py from the *_STANDARDIZATION dicts in
+medical_terms_dict.py. Do not edit by hand; re-run the generator instead.
+"""
+
+MEDICATION_LOOKUP = {'ibuprofen': 'ibuprofen',
+ 'motrin': 'ibuprofen',
+ 'advil': 'ibuprofen',
+ 'nuprin': 'ibuprofen',
+ 'acetaminophen': 'acetaminophen',
+ 'tylenol': 'acetaminophen',
+ 'paracetamol': 'acetaminophen',
+ 'apap': 'acetaminophen',
+ 'aspirin': 'aspirin',
+ 'asa': 'aspirin',
+ 'acetylsalicylic acid': 'aspirin',
+ 'naproxen': 'naproxen',
+ 'aleve': 'naproxen',
+ 'naprosyn': 'naproxen',
+ 'amoxicillin': 'amoxicillin',
+ 'amoxil': 'amoxicillin',
+ 'trimox': 'amoxicillin',
+ 'azithromycin': 'azithromycin',
+ 'zithromax': 'azithromycin',
+ 'z-pack': 'azithromycin',
+ 'zpak': 'azithromycin',
+ 'ciprofloxacin': 'ciprofloxacin',
+ 'cipro': 'ciprofloxacin',
+ 'doxycycline': 'doxycycline',
+ 'vibramycin': 'doxycycline',
+ 'doryx': 'doxycycline',
+ 'penicillin': 'penicillin',
+ 'pen vk': 'penicillin',
+ 'penicillin vk': 'penicillin',
+ 'cephalexin': 'cephalexin',
+ 'keflex': 'cephalexin',
+ 'metformin': 'metformin',
+ 'glucophage': 'metformin',
+ 'insulin': 'insulin',
+ 'humulin': 'insulin',
+ 'novolin': 'insulin',
+ 'lantus': 'insulin',
+ 'humalog': 'insulin',
+ 'novolog': 'insulin',
+ 'glipizide': 'glipizide',
+ 'glucotrol': 'glipizide',
+ 'glyburide': 'glyburide',
+ 'diabeta': 'glyburide',
+ 'micronase': 'glyburide',
+ 'lisinopril': 'lisinopril',
+ 'prinivil': 'lisinopril',
+ 'zestril': 'lisinopril',
+ 'losartan': 'losartan',
+ 'cozaar': 'losartan',
+ 'amlodipine': 'amlodipine',
+ 'norvasc': 'amlodipine',
+ 'metoprolol': 'metoprolol',
+ 'lopressor': 'metoprolol',
+ 'toprol': 'metoprolol',
+ 'atenolol': 'atenolol',
+ 'tenormin': 'atenolol',
+ 'hydrochlorothiazide': 'hydrochlorothiazide',
+ 'hctz': 'hydrochlorothiazide',
+ 'microzide': 'hydrochlorothiazide',
+ 'atorvastatin': 'atorvastatin',
+ 'lipitor': 'atorvastatin',
+ 'simvastatin': 'simvastatin',
+ 'zocor': 'simvastatin',
+ 'rosuvastatin': 'rosuvastatin',
+ 'crestor': 'rosuvastatin',
+ 'pravastatin': 'pravastatin',
+ 'pravachol': 'pravastatin',
+ 'diphenhydramine': 'diphenhydramine',
+ 'benadryl': 'diphenhydramine',
+ 'loratadine': 'loratadine',
+ 'claritin': 'loratadine',
+ 'cetirizine': 'cetirizine',
+ 'zyrtec': 'cetirizine',
+ 'fexofenadine': 'fexofenadine',
+ 'allegra': 'fexofenadine',
+ 'omeprazole': 'omeprazole',
+ 'prilosec': 'omeprazole',
+ 'pantoprazole': 'pantoprazole',
+ 'protonix': 'pantoprazole',
+ 'esomeprazole': 'esomeprazole',
+ 'nexium': 'esomeprazole',
+ 'ranitidine': 'ranitidine',
+ 'zantac': 'ranitidine',
+ 'famotidine': 'famotidine',
+ 'pepcid': 'famotidine',
+ 'sertraline': 'sertraline',
+ 'zoloft': 'sertraline',
+ 'fluoxetine': 'fluoxetine',
+ 'prozac': 'fluoxetine',
+ 'escitalopram': 'escitalopram',
+ 'lexapro': 'escitalopram',
+ 'citalopram': 'citalopram',
+ 'celexa': 'citalopram',
+ 'bupropion': 'bupropion',
+ 'wellbutrin': 'bupropion',
+ 'levothyroxine': 'levothyroxine',
+ 'synthroid': 'levothyroxine',
+ 'levoxyl': 'levothyroxine',
+ 'warfarin': 'warfarin',
+ 'coumadin': 'warfarin',
+ 'apixaban': 'apixaban',
+ 'eliquis': 'apixaban',
+ 'rivaroxaban': 'rivaroxaban',
+ 'xarelto': 'rivaroxaban',
+ 'albuterol': 'albuterol',
+ 'proventil': 'albuterol',
+ 'ventolin': 'albuterol',
+ 'fluticasone': 'fluticasone',
+ 'flovent': 'fluticasone',
+ 'flonase': 'fluticasone',
+ 'montelukast': 'montelukast',
+ 'singulair': 'montelukast'}
+
+CONDITION_LOOKUP = {'hypertension': 'hypertension',
+ 'high blood pressure': 'hypertension',
+ 'htn': 'hypertension',
+ 'elevated bp': 'hypertension',
+ 'hyperlipidemia': 'hyperlipidemia',
+ 'high cholesterol': 'hyperlipidemia',
+ 'dyslipidemia': 'hyperlipidemia',
+ 'coronary artery disease': 'coronary artery disease',
+ 'cad': 'coronary artery disease',
+ 'heart disease': 'coronary artery disease',
+ 'coronary disease': 'coronary artery disease',
+ 'myocardial infarction': 'myocardial infarction',
+ 'mi': 'myocardial infarction',
+ 'heart attack': 'myocardial infarction',
+ 'congestive heart failure': 'congestive heart failure',
+ 'chf': 'congestive heart failure',
+ 'heart failure': 'congestive heart failure',
+ 'atrial fibrillation': 'atrial fibrillation',
+ 'afib': 'atrial fibrillation',
+ 'a-fib': 'atrial fibrillation',
+ 'coronary artery bypass graft': 'coronary artery bypass graft',
+ 'cabg': 'coronary artery bypass graft',
+ 'bypass': 'coronary artery bypass graft',
+ 'bypass surgery': 'coronary artery bypass graft',
+ 'diabetes mellitus': 'diabetes mellitus',
+ 'diabetes': 'diabetes mellitus',
+ 'dm': 'diabetes mellitus',
+ 'diabetic': 'diabetes mellitus',
+ 'type 2 diabetes': 'type 2 diabetes',
+ 't2dm': 'type 2 diabetes',
+ 'type ii diabetes': 'type 2 diabetes',
+ 'niddm': 'type 2 diabetes',
+ 'type 1 diabetes': 'type 1 diabetes',
+ 't1dm': 'type 1 diabetes',
+ 'type i diabetes': 'type 1 diabetes',
+ 'iddm': 'type 1 diabetes',
+ 'hypothyroidism': 'hypothyroidism',
+ 'underactive thyroid': 'hypothyroidism',
+ 'low thyroid': 'hypothyroidism',
+ 'hyperthyroidism': 'hyperthyroidism',
+ 'overactive thyroid': 'hyperthyroidism',
+ 'high thyroid': 'hyperthyroidism',
+ 'asthma': 'asthma',
+ 'reactive airway disease': 'asthma',
+ 'rad': 'asthma',
+ 'chronic obstructive pulmonary disease': 'chronic obstructive pulmonary '
+                                          'disease',
+ 'copd': 'chronic obstructive pulmonary disease',
+ 'emphysema': 'chronic obstructive pulmonary disease',
+ 'pneumonia': 'pneumonia',
+ 'lung infection': 'pneumonia',
+ 'upper respiratory infection': 'upper respiratory infection',
+ 'uri': 'upper respiratory infection',
+ 'common cold': 'upper respiratory infection',
+ 'gastroesophageal reflux disease': 'gastroesophageal reflux disease',
+ 'gerd': 'gastroesophageal reflux disease',
+ 'acid reflux': 'gastroesophageal reflux disease',
+ 'reflux': 'gastroesophageal reflux disease',
+ 'irritable bowel syndrome': 'irritable bowel syndrome',
+ 'ibs': 'irritable bowel syndrome',
+ 'inflammatory bowel disease': 'inflammatory bowel disease',
+ 'ibd': 'inflammatory bowel disease',
+ 'crohns': 'inflammatory bowel disease',
+ 'ulcerative colitis': 'inflammatory bowel disease',
+ 'depression': 'depression',
+ 'major depressive disorder': 'depression',
+ 'mdd': 'depression',
+ 'anxiety': 'anxiety',
+ 'generalized anxiety disorder': 'anxiety',
+ 'gad': 'anxiety',
+ 'bipolar disorder': 'bipolar disorder',
+ 'manic depression': 'bipolar disorder',
+ 'attention deficit hyperactivity disorder': 'attention deficit hyperactivity '
+                                             'disorder',
+ 'adhd': 'attention deficit hyperactivity disorder',
+ 'add': 'attention deficit hyperactivity disorder',
+ 'rheumatoid arthritis': 'rheumatoid arthritis',
+ 'ra': 'rheumatoid arthritis',
+ 'systemic lupus erythematosus': 'systemic lupus erythematosus',
+ 'sle': 'systemic lupus erythematosus',
+ 'lupus': 'systemic lupus erythematosus',
+ 'multiple sclerosis': 'multiple sclerosis',
+ 'ms': 'multiple sclerosis',
+ 'transient ischemic attack': 'transient ischemic attack',
+ 'tia': 'transient ischemic attack',
+ 'mini stroke': 'transient ischemic attack',
+ 'cerebrovascular accident': 'cerebrovascular accident',
+ 'cva': 'cerebrovascular accident',
+ 'stroke': 'cerebrovascular accident',
+ 'pulmonary embolism': 'pulmonary embolism',
+ 'pe': 'pulmonary embolism',
+ 'deep vein thrombosis': 'deep vein thrombosis',
+ 'dvt': 'deep vein thrombosis',
+ 'blood clot': 'deep vein thrombosis',
+ 'angioplasty': 'angioplasty',
+ 'ptca': 'angioplasty',
+ 'balloon angioplasty': 'angioplasty',
+ 'cardiac catheterization': 'cardiac catheterization',
+ 'cardiac cath': 'cardiac catheterization',
+ 'osteoarthritis': 'osteoarthritis',
+ 'oa': 'osteoarthritis',
+ 'degenerative joint disease': 'osteoarthritis',
+ 'djd': 'osteoarthritis',
+ 'chronic kidney disease': 'chronic kidney disease',
+ 'ckd': 'chronic kidney disease',
+ 'renal insufficiency': 'chronic kidney disease',
+ 'end stage renal disease': 'end stage renal disease',
+ 'esrd': 'end stage renal disease',
+ 'kidney failure': 'end stage renal disease',
+ 'urinary tract infection': 'urinary tract infection',
+ 'uti': 'urinary tract infection',
+ 'bladder infection': 'urinary tract infection',
+ 'migraine': 'migraine',
+ 'migraine headache': 'migraine',
+ 'seizure disorder': 'seizure disorder',
+ 'epilepsy': 'seizure disorder'}
+
+ALLERGY_LOOKUP = {'penicillin': 'penicillin',
+ 'pcn': 'penicillin',
+ 'pen': 'penicillin',
+ 'sulfa drugs': 'sulfa drugs',
+ 'sulfa': 'sulfa drugs',
+ 'sulfamethoxazole': 'sulfa drugs',
+ 'sulfonamides': 'sulfa drugs',
+ 'shellfish': 'shellfish',
+ 'shrimp': 'shellfish',
+ 'crab': 'shellfish',
+ 'lobster': 'shellfish',
+ 'seafood': 'shellfish',
+ 'tree nuts': 'tree nuts',
+ 'walnuts': 'tree nuts',
+ 'almonds': 'tree nuts',
+ 'cashews': 'tree nuts',
+ 'pecans': 'tree nuts',
+ 'peanuts': 'peanuts',
+ 'peanut': 'peanuts',
+ 'eggs': 'eggs',
+ 'egg': 'eggs',
+ 'dairy': 'dairy',
+ 'milk': 'dairy',
+ 'lactose': 'dairy',
+ 'gluten': 'gluten',
+ 'wheat': 'gluten',
+ 'celiac': 'gluten',
+ 'latex': 'latex',
+ 'rubber': 'latex'}
+
+VACCINE_LOOKUP = {'influenza': 'influenza',
+ 'flu': 'influenza',
+ 'flu shot': 'influenza',
+ 'influenza vaccine': 'influenza',
+ 'covid-19': 'covid-19',
+ 'covid': 'covid-19',
+ 'coronavirus': 'covid-19',
+ 'sars-cov-2': 'covid-19',
+ 'mrna vaccine': 'covid-19',
+ 'pneumococcal': 'pneumococcal',
+ 'pneumonia': 'pneumococcal',
+ 'prevnar': 'pneumococcal',
+ 'pneumovax': 'pneumococcal',
+ 'tetanus': 'tetanus',
+ 'tdap': 'tetanus',
+ 'td': 'tetanus',
+ 'tetanus toxoid': 'tetanus',
+ 'measles mumps rubella': 'measles mumps rubella',
+ 'mmr': 'measles mumps rubella',
+ 'hepatitis b': 'hepatitis b',
+ 'hep b': 'hepatitis b',
+ 'hbv': 'hepatitis b',
+ 'hepatitis a': 'hepatitis a',
+ 'hep a': 'hepatitis a',
+ 'hav': 'hepatitis a',
+ 'varicella': 'varicella',
+ 'chickenpox': 'varicella',
+ 'varicella zoster': 'varicella',
+ 'shingles': 'shingles',
+ 'zoster': 'shingles',
+ 'herpes zoster': 'shingles',
+ 'shingrix': 'shingles',
+ 'human papillomavirus': 'human papillomavirus',
+ 'hpv': 'human papillomavirus',
+ 'gardasil': 'human papillomavirus'}
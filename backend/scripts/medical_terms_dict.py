@@ -5,6 +5,7 @@ Contains common medications, conditions, allergies, and their variants.
 """
 from __future__ import annotations
 
+import sys
 from typing import Dict, List
 
 
@@ -174,46 +175,81 @@ def create_reverse_mapping(standardization_dict: Dict[str, List[str]]) -> Dict[s
         standardization_dict: Dictionary of standard_term -> [variants]
 
     Returns:
-        Dictionary of variant -> standard_term
+        Dictionary of variant -> standard_term (the standard term maps to itself).
+        Keys and values are interned, so every row shares one copy of each term.
     """
-    reverse_map = {}
+    return {
+        sys.intern(term.lower()): sys.intern(standard.lower())
+        for standard, variants in standardization_dict.items()
+        for term in (standard, *variants)
+    }
+
 
-    for standard, variants in standardization_dict.items():
-        # Add the standard term itself
-        reverse_map[standard] = standard
+def _intern_lookup(lookup: Dict[str, str]) -> Dict[str, str]:
+    """Intern the keys and values of a baked lookup (see create_reverse_mapping)."""
+    return {sys.intern(term): sys.intern(standard) for term, standard in lookup.items()}
 
-        # Add all variants
-        for variant in variants:
-            reverse_map[variant.lower()] = standard.lower()
 
-    return reverse_map
+# Reverse mappings for quick lookup, baked as literals by generate_lookups.py
+# (re-run it after editing the dicts above); built here if the module is missing.
+try:
+    from medical_lookups_generated import (
+        ALLERGY_LOOKUP,
+        CONDITION_LOOKUP,
+        MEDICATION_LOOKUP,
+        VACCINE_LOOKUP,
+    )
+    MEDICATION_LOOKUP = _intern_lookup(MEDICATION_LOOKUP)
+    CONDITION_LOOKUP = _intern_lookup(CONDITION_LOOKUP)
+    ALLERGY_LOOKUP = _intern_lookup(ALLERGY_LOOKUP)
+    VACCINE_LOOKUP = _intern_lookup(VACCINE_LOOKUP)
+except ImportError:
+    MEDICATION_LOOKUP = create_reverse_mapping(MEDICATION_STANDARDIZATION)
+    CONDITION_LOOKUP = create_reverse_mapping(CONDITION_STANDARDIZATION)
+    ALLERGY_LOOKUP = create_reverse_mapping(ALLERGY_STANDARDIZATION)
+    VACCINE_LOOKUP = create_reverse_mapping(VACCINE_STANDARDIZATION)
 
 
-# Create reverse mappings for quick lookup
-MEDICATION_LOOKUP = create_reverse_mapping(MEDICATION_STANDARDIZATION)
-CONDITION_LOOKUP = create_reverse_mapping(CONDITION_STANDARDIZATION)
-ALLERGY_LOOKUP = create_reverse_mapping(ALLERGY_STANDARDIZATION)
-VACCINE_LOOKUP = create_reverse_mapping(VACCINE_STANDARDIZATION)
+# The *_fast variants take an already-lowercased term (e.g. tokens from
+# TextNormalizer.normalize, which lowercases) and skip the str.lower() copy.
+def standardize_medication_fast(term_lower: str) -> str:
+    """Standardize a medication name; term_lower must already be lowercase."""
+    return MEDICATION_LOOKUP.get(term_lower, term_lower)
 
 
 def standardize_medication(term: str) -> str:
     """Standardize a medication name."""
-    return MEDICATION_LOOKUP.get(term.lower(), term.lower())
+    return standardize_medication_fast(term.lower())
+
+
+def standardize_condition_fast(term_lower: str) -> str:
+    """Standardize a medical condition; term_lower must already be lowercase."""
+    return CONDITION_LOOKUP.get(term_lower, term_lower)
 
 
 def standardize_condition(term: str) -> str:
     """Standardize a medical condition."""
-    return CONDITION_LOOKUP.get(term.lower(), term.lower())
+    return standardize_condition_fast(term.lower())
+
+
+def standardize_allergy_fast(term_lower: str) -> str:
+    """Standardize an allergy term; term_lower must already be lowercase."""
+    return ALLERGY_LOOKUP.get(term_lower, term_lower)
 
 
 def standardize_allergy(term: str) -> str:
     """Standardize an allergy term."""
-    return ALLERGY_LOOKUP.get(term.lower(), term.lower())
+    return standardize_allergy_fast(term.lower())
+
+
+def standardize_vaccine_fast(term_lower: str) -> str:
+    """Standardize a vaccine name; term_lower must already be lowercase."""
+    return VACCINE_LOOKUP.get(term_lower, term_lower)
 
 
 def standardize_vaccine(term: str) -> str:
     """Standardize a vaccine name."""
-    return VACCINE_LOOKUP.get(term.lower(), term.lower())
+    return standardize_vaccine_fast(term.lower())
 
 
 def get_all_lookups() -> Dict[str, Dict[str, str]]:
@@ -5,11 +5,20 @@ Processes text fields to create unified terminology across datasets.
 """
 from __future__ import annotations
 
+import codecs
 import csv
 import json
-from collections import defaultdict
+import os
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Iterable
+from typing import Callable, Dict, List, Optional, Set, Iterable, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback (slower, same file format)
+    orjson = None
 
 from text_normalizer import TextNormalizer, create_term_standardization_map
 from medical_terms_dict import get_all_lookups
@@ -25,6 +34,110 @@ TEXT_FIELDS = [
     'ALLERGIES',
 ]
 
+# Max distinct text values memoized per cache (VAERS text fields repeat heavily:
+# "None", "NKDA", common meds), so each distinct value is normalized once
+TEXT_CACHE_SIZE = 200_000
+
+# Rows per batch handed to a preprocess_csv worker process
+WORKER_BATCH_ROWS = 2_000
+
+# Rows per writerows() call, and output file buffer size, in preprocess_csv
+WRITE_BATCH_ROWS = 10_000
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+@lru_cache(maxsize=1024)
+def _parse_year(year_str: str) -> Optional[int]:
+    """Parse a YEAR cell ("2016", "2016.0"); None if not numeric."""
+    try:
+        return int(float(year_str))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _detect_encoding(csv_path: Path, mtime_ns: int, encodings: Tuple[str, ...]) -> str:
+    """
+    First of encodings that decodes the whole file (utf-8-sig if it has a BOM),
+    else latin1. Checked once per file version (path, mtime) on raw bytes with an
+    incremental decoder, so the CSV is only parsed by the pass that reads it.
+    """
+    with csv_path.open('rb') as f:
+        bom = f.read(3) == codecs.BOM_UTF8
+        for enc in encodings:
+            if not enc:
+                continue
+            f.seek(0)
+            decoder = codecs.getincrementaldecoder(enc)()
+            try:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    decoder.decode(block)
+                decoder.decode(b'', final=True)
+            except (UnicodeDecodeError, LookupError):
+                continue
+            return 'utf-8-sig' if bom and codecs.lookup(enc).name == 'utf-8' else enc
+    return 'latin1'
+
+
+def _cache_summary(cached) -> str:
+    """Hit rate of an lru_cache'd function, for [INFO] logging."""
+    info = cached.cache_info()
+    calls = info.hits + info.misses
+    rate = info.hits / calls * 100 if calls else 0.0
+    return f"{info.hits:,}/{calls:,} cache hits ({rate:.1f}%), {info.currsize:,} distinct values"
+
+
+def _fit_row(row: List[str], width: int) -> List[str]:
+    """Pad (with '') or trim a csv.reader row to the header width, in place."""
+    if len(row) != width:
+        row[width:] = []
+        row.extend([''] * (width - len(row)))
+    return row
+
+
+def _year_excluded(row: List[str], year_idx: Optional[int], year_filter: Optional[Set[int]]) -> bool:
+    """True if the row has a numeric YEAR outside year_filter (blank/invalid years are kept)."""
+    if year_filter is None or year_idx is None:
+        return False
+    year = _parse_year(row[year_idx].strip() or 'x')
+    return year is not None and year not in year_filter
+
+
+def _count_terms(
+    extract: Callable[[str], Optional[Tuple[str, ...]]],
+    n_fields: int,
+    batch: List[List[str]],
+) -> Tuple[List[Counter], List[int], List[int]]:
+    """
+    Count terms over a batch of text-field value lists (one value per field).
+    Returns per-field term Counters and empty / non-empty value counts.
+    """
+    counts = [Counter() for _ in range(n_fields)]
+    empty = [0] * n_fields
+    non_empty = [0] * n_fields
+    for texts in batch:
+        for k, text in enumerate(texts):
+            if not text or text.strip() == '':
+                empty[k] += 1
+                continue
+
+            # Normalize and extract terms
+            terms = extract(text)
+            if terms is not None:
+                counts[k].update(terms)
+                non_empty[k] += 1
+    return counts, empty, non_empty
+
+
+# Field -> preferred medical lookup (other fields use all lookups)
+FIELD_LOOKUP_TYPES = {
+    'OTHER_MEDS': 'medications',
+    'PRIOR_VAX': 'vaccines',
+    'ALLERGIES': 'allergies',
+    'CUR_ILL': 'conditions',
+    'HISTORY': 'conditions',
+}
+
 
 class VAERSPreprocessor:
     """
@@ -37,6 +150,7 @@ class VAERSPreprocessor:
         min_term_frequency: int = 3,
         similarity_threshold: float = 0.85,
         use_medical_filter: bool = True,
+        lemma_cache_path: Optional[Path] = None,
     ):
         """
         Initialize the preprocessor.
@@ -46,8 +160,23 @@ class VAERSPreprocessor:
             min_term_frequency: Minimum frequency for terms to be included
             similarity_threshold: Similarity threshold for term standardization
             use_medical_filter: Filter to only keep terms in medical dictionary
+            lemma_cache_path: JSON file of word -> lemma pairs kept across runs
+                (loaded here if it exists, written by save_lemma_cache())
         """
+        # Constructor args, so worker processes can rebuild an equivalent preprocessor
+        self._init_kwargs = {
+            'use_lemmatization': use_lemmatization,
+            'min_term_frequency': min_term_frequency,
+            'similarity_threshold': similarity_threshold,
+            'use_medical_filter': use_medical_filter,
+            'lemma_cache_path': lemma_cache_path,
+        }
+
         self.normalizer = TextNormalizer(use_lemmatization=use_lemmatization)
+        # Lemmas from earlier runs: WordNet is only consulted for words not seen before
+        self.lemma_cache_path = lemma_cache_path
+        if lemma_cache_path is not None and self.normalizer.use_lemmatization:
+            self.normalizer.load_lemma_cache(lemma_cache_path)
         self.min_term_frequency = min_term_frequency
         self.similarity_threshold = similarity_threshold
         self.use_medical_filter = use_medical_filter
@@ -55,18 +184,86 @@ class VAERSPreprocessor:
         # Load medical dictionaries
         self.medical_lookups = get_all_lookups()
 
-        # Create a combined lookup of all medical terms
-        self.all_medical_terms = set()
+        # Merged term -> standard over all lookups (first lookup wins on overlap)
+        self.merged_lookup: Dict[str, str] = {}
         for lookup in self.medical_lookups.values():
-            self.all_medical_terms.update(lookup.keys())
+            for term, standard in lookup.items():
+                self.merged_lookup.setdefault(term, standard)
+
+        # Per-field term -> standard: field-specific lookup first, then the merged lookup
+        # (one dict per lookup type, shared by fields of the same type)
+        type_lookups = {
+            lookup_type: {**self.merged_lookup, **self.medical_lookups[lookup_type]}
+            for lookup_type in set(FIELD_LOOKUP_TYPES.values())
+        }
+        self.field_medical_lookups: Dict[str, Dict[str, str]] = {
+            field: type_lookups[lookup_type]
+            for field, lookup_type in FIELD_LOOKUP_TYPES.items()
+        }
+
+        # Multi-word lookup keys ("coronary artery disease", "hepatitis b") never survive
+        # extract_terms as one token, so they are matched on the normalized token
+        # stream through a word trie per lookup
+        tries_by_lookup = {
+            id(lookup): self._build_phrase_trie(lookup)
+            for lookup in (self.merged_lookup, *type_lookups.values())
+        }
+        self.merged_phrase_trie = tries_by_lookup[id(self.merged_lookup)]
+        self.field_phrase_tries: Dict[str, Dict] = {
+            field: tries_by_lookup[id(lookup)]
+            for field, lookup in self.field_medical_lookups.items()
+        }
 
         # Statistics
         self.field_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         self.term_mappings: Dict[str, Dict[str, str]] = {}  # field -> term -> standard_term
 
+        # Per-distinct-value memoization (cleared whenever term_mappings change)
+        self._extract_cached = lru_cache(maxsize=TEXT_CACHE_SIZE)(self._extract)
+        self._preprocess_cached = lru_cache(maxsize=TEXT_CACHE_SIZE)(self._preprocess_text)
+
+    def _build_phrase_trie(self, lookup: Dict[str, str]) -> Dict:
+        """
+        Build a word trie over the multi-word keys of a medical lookup.
+
+        Keys are normalized like field text, so they match after lemmatization and
+        abbreviation expansion. Nodes are {word: child}; a None key holds the standard term.
+
+        Args:
+            lookup: Medical term -> standard term
+
+        Returns:
+            Root trie node (empty if the lookup has no multi-word keys)
+        """
+        trie: Dict = {}
+        for term, standard in lookup.items():
+            words = self.normalizer.normalize(term).split()
+            if len(words) < 2:
+                continue
+            node = trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node.setdefault(None, standard)
+        return trie
+
+    def open_csv(self, csv_path: Path, encodings: List[str]):
+        """
+        Open a CSV for reading in the first of encodings that decodes the whole file.
+        Detection runs once per file version; bytes no encoding accepts are replaced (latin1).
+
+        Args:
+            csv_path: Path to CSV file
+            encodings: List of encodings to try
+
+        Returns:
+            Open text file
+        """
+        enc = _detect_encoding(csv_path, csv_path.stat().st_mtime_ns, tuple(encodings))
+        return csv_path.open('r', newline='', encoding=enc, errors='replace')
+
     def read_csv_with_encoding(self, csv_path: Path, encodings: List[str]) -> Iterable[Dict[str, str]]:
         """
-        Read CSV with encoding fallback.
+        Read CSV with encoding detection (see open_csv).
 
         Args:
             csv_path: Path to CSV file
@@ -75,37 +272,44 @@ class VAERSPreprocessor:
         Yields:
             Dictionary rows
         """
-        for enc in encodings:
-            if not enc:
-                continue
-            try:
-                with csv_path.open('r', newline='', encoding=enc, errors='strict') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        yield row
-                return
-            except (UnicodeDecodeError, FileNotFoundError):
-                continue
+        with self.open_csv(csv_path, encodings) as f:
+            yield from csv.DictReader(f)
+
+    def read_csv_rows_with_encoding(self, csv_path: Path, encodings: List[str]) -> Iterable[List[str]]:
+        """
+        Read CSV rows as lists with encoding detection (see open_csv).
 
-        # Fallback to latin1 with replacement
-        with csv_path.open('r', newline='', encoding='latin1', errors='replace') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                yield row
+        Args:
+            csv_path: Path to CSV file
+            encodings: List of encodings to try
+
+        Yields:
+            Header row, then data rows (blank lines skipped)
+        """
+        with self.open_csv(csv_path, encodings) as f:
+            for row in csv.reader(f):
+                if row:
+                    yield row
 
     def extract_field_terms(
         self,
         csv_path: Path,
         year_filter: Optional[Set[int]] = None,
         encodings: Optional[List[str]] = None,
+        workers: Optional[int] = None,
     ) -> Dict[str, Dict[str, int]]:
         """
         Extract and count terms from text fields.
 
+        Text-field values are normalized and counted in batches by a pool of worker
+        processes; per-batch counts are merged in input order, so the result matches
+        a single-process run.
+
         Args:
             csv_path: Path to VAERS CSV file
             year_filter: Set of years to include (None = all years)
             encodings: List of encodings to try
+            workers: Worker processes (default: CPU count; 1 = extract in-process)
 
         Returns:
             Dictionary mapping field -> term -> frequency
@@ -113,58 +317,100 @@ class VAERSPreprocessor:
         if encodings is None:
             encodings = ['utf-8', 'utf-8-sig', 'cp1252', 'latin1']
 
-        field_terms: Dict[str, List[str]] = defaultdict(list)
+        field_counts: Dict[str, Counter] = defaultdict(Counter)
         rows_processed = 0
         rows_filtered = 0
 
         print(f"[INFO] Extracting terms from {csv_path.name}...")
 
-        for row in self.read_csv_with_encoding(csv_path, encodings):
-            # Apply year filter if specified
-            if year_filter is not None:
-                year_str = row.get('YEAR', '').strip()
-                if year_str:
-                    try:
-                        year = int(float(year_str))
-                        if year not in year_filter:
-                            rows_filtered += 1
-                            continue
-                    except ValueError:
-                        pass
-
-            rows_processed += 1
-
-            # Process each text field
-            for field in TEXT_FIELDS:
-                if field not in row:
-                    continue
-
-                text = row.get(field, '')
-                if not text or text.strip() == '':
-                    self.field_stats[field]['empty'] += 1
+        # Rows are lists; header positions are resolved once per file
+        rows = iter(self.read_csv_rows_with_encoding(csv_path, encodings))
+        header = next(rows, [])
+        width = len(header)
+        year_idx = header.index('YEAR') if 'YEAR' in header else None
+        text_cols = [(i, field) for i, field in enumerate(header) if field in TEXT_FIELDS]
+
+        # Per-column empty/non-empty counts (plain ints), added to field_stats once per file
+        empty = [0] * len(text_cols)
+        non_empty = [0] * len(text_cols)
+        counters = [field_counts[field] for _, field in text_cols]
+        n_fields = len(text_cols)
+
+        def text_batches() -> Iterator[List[List[str]]]:
+            """Text-field values of the rows kept by the year filter, in batches."""
+            nonlocal rows_filtered
+            batch: List[List[str]] = []
+            for row in rows:
+                _fit_row(row, width)
+
+                # Apply year filter if specified
+                if _year_excluded(row, year_idx, year_filter):
+                    rows_filtered += 1
                     continue
 
-                # Normalize and extract terms
-                normalized = self.normalizer.normalize(text)
-                if normalized:
-                    terms = self.normalizer.extract_terms(normalized)
-                    field_terms[field].extend(terms)
-                    self.field_stats[field]['non_empty'] += 1
-
-            if rows_processed % 10000 == 0:
+                batch.append([row[i] for i, _ in text_cols])
+                if len(batch) >= WORKER_BATCH_ROWS:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        def add_counts(batch_rows: int, result: Tuple[List[Counter], List[int], List[int]]):
+            nonlocal rows_processed
+            batch_counts, batch_empty, batch_non_empty = result
+            for k in range(n_fields):
+                counters[k].update(batch_counts[k])
+                empty[k] += batch_empty[k]
+                non_empty[k] += batch_non_empty[k]
+            before = rows_processed
+            rows_processed += batch_rows
+            if rows_processed // 10000 > before // 10000:
                 print(f"  Processed {rows_processed:,} rows...")
 
-        print(f"[INFO] Processed {rows_processed:,} rows (filtered {rows_filtered:,} by year)")
+        if workers is None:
+            workers = os.cpu_count() or 1
 
-        # Count term frequencies per field
-        field_frequencies = {}
-        for field, terms in field_terms.items():
-            field_frequencies[field] = self.normalizer.extract_unique_terms(
-                [' '.join(terms)],
-                min_frequency=self.min_term_frequency
-            )
+        if workers <= 1:
+            for batch in text_batches():
+                add_counts(len(batch), _count_terms(self._extract_cached, n_fields, batch))
+        else:
+            pending: deque = deque()  # (batch row count, future of its counts)
+
+            def merge_oldest():
+                batch_rows, future = pending.popleft()
+                result, lemmas = future.result()
+                self.normalizer.add_lemmas(lemmas)
+                add_counts(batch_rows, result)
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self._init_kwargs, {}),
+            ) as pool:
+                for batch in text_batches():
+                    pending.append((len(batch), pool.submit(_extract_batch, n_fields, batch)))
+                    # Bound memory: keep at most 2 batches in flight per worker
+                    if len(pending) >= 2 * workers:
+                        merge_oldest()
+                while pending:
+                    merge_oldest()
+
+        for k, (_, field) in enumerate(text_cols):
+            if empty[k]:
+                self.field_stats[field]['empty'] += empty[k]
+            if non_empty[k]:
+                self.field_stats[field]['non_empty'] += non_empty[k]
 
-        return field_frequencies
+        print(f"[INFO] Processed {rows_processed:,} rows (filtered {rows_filtered:,} by year)")
+        if workers <= 1:
+            print(f"[INFO] Normalize/extract: {_cache_summary(self._extract_cached)}")
+
+        # Keep terms meeting the minimum frequency per field
+        return {
+            field: {term: count for term, count in counts.items() if count >= self.min_term_frequency}
+            for field, counts in field_counts.items()
+            if counts
+        }
 
     def build_standardization_maps(
         self,
@@ -186,124 +432,108 @@ class VAERSPreprocessor:
         for field, term_freqs in field_frequencies.items():
             print(f"  Processing {field}: {len(term_freqs)} unique terms")
 
-            # Create standardization map
+            # Create standardization map. Dictionary terms are standardized by the
+            # medical lookup, so fuzzy matching never remaps them (misspellings can
+            # still map onto them)
+            fixed_terms = (
+                self.field_medical_lookups.get(field, self.merged_lookup).keys()
+                if self.use_medical_filter else None
+            )
             std_map = create_term_standardization_map(
                 term_freqs,
-                similarity_threshold=self.similarity_threshold
+                similarity_threshold=self.similarity_threshold,
+                fixed_terms=fixed_terms,
             )
 
             standardization_maps[field] = std_map
             print(f"    Created {len(std_map)} standardization mappings")
 
         self.term_mappings = standardization_maps
+        self._preprocess_cached.cache_clear()
         return standardization_maps
 
-    def filter_and_standardize_medical_terms(self, terms: List[str], field: str) -> List[str]:
+    def _extract(self, text: str) -> Optional[Tuple[str, ...]]:
         """
-        Filter terms to only include medical terms and standardize them.
-
-        Args:
-            terms: List of terms
-            field: Field name (for field-specific filtering)
-
-        Returns:
-            Filtered and standardized list of medical terms
+        Normalize text and extract its terms (None if nothing survives normalization).
+        Called through self._extract_cached.
         """
-        if not self.use_medical_filter:
-            return terms
-
-        filtered = []
-
-        # Field-specific lookups
-        field_lookups = {
-            'OTHER_MEDS': ('medications', self.medical_lookups['medications']),
-            'PRIOR_VAX': ('vaccines', self.medical_lookups['vaccines']),
-            'ALLERGIES': ('allergies', self.medical_lookups['allergies']),
-            'CUR_ILL': ('conditions', self.medical_lookups['conditions']),
-            'HISTORY': ('conditions', self.medical_lookups['conditions']),
-        }
-
-        # Get relevant lookup for this field
-        if field in field_lookups:
-            lookup_type, relevant_lookup = field_lookups[field]
-        else:
-            # For LAB_DATA and other fields, use all medical terms
-            lookup_type = None
-            relevant_lookup = None
-
-        for term in terms:
-            term_lower = term.lower()
-
-            # Check field-specific lookup first and standardize
-            if relevant_lookup and term_lower in relevant_lookup:
-                standardized = relevant_lookup[term_lower]
-                filtered.append(standardized)
-            # Then check all medical terms
-            elif term_lower in self.all_medical_terms:
-                # Find which lookup it belongs to and standardize
-                for lookup_dict in self.medical_lookups.values():
-                    if term_lower in lookup_dict:
-                        filtered.append(lookup_dict[term_lower])
-                        break
-
-        return filtered
+        normalized = self.normalizer.normalize(text)
+        if not normalized:
+            return None
+        return tuple(self.normalizer.extract_terms(normalized))
 
     def preprocess_row(self, row: Dict[str, str]) -> Dict[str, str]:
         """
         Preprocess a single row by normalizing text fields.
         Only keeps relevant medical terms, formatted as comma-separated values.
 
+        The row is updated in place.
+
         Args:
             row: CSV row as dictionary
 
         Returns:
-            Row with preprocessed text fields
+            The same row, with preprocessed text fields
         """
-        processed_row = row.copy()
-
         for field in TEXT_FIELDS:
-            if field not in row:
-                continue
+            if field in row:
+                row[field] = self._preprocess_cached(field, row[field])
 
-            text = row.get(field, '')
+        return row
 
-            # Check if text indicates "none/unknown"
-            if self.normalizer.is_none_text(text):
-                processed_row[field] = ''
+    def _preprocess_text(self, field: str, text: Optional[str]) -> str:
+        """
+        Preprocess one text field value (see preprocess_row).
+        Called through self._preprocess_cached, so each distinct (field, text) is processed once.
+        """
+        # Empty, or text indicating "none/unknown"
+        if self.normalizer.is_none_text(text):
+            return ''
+
+        # Normalize
+        normalized = self.normalizer.normalize(text)
+
+        # One pass over the words: longest multi-word medical phrase first; otherwise
+        # keep the word if extract_terms would, apply the term mapping and keep only
+        # medical terms (standardized, field-specific lookup first). Duplicates are
+        # dropped while preserving order.
+        words = normalized.split()
+        mapping = self.term_mappings.get(field, {})
+        if self.use_medical_filter:
+            lookup = self.field_medical_lookups.get(field, self.merged_lookup)
+            trie = self.field_phrase_tries.get(field, self.merged_phrase_trie)
+        else:
+            lookup = None
+            trie = {}
+        unique_terms: Dict[str, None] = {}
+        i, n = 0, len(words)
+        while i < n:
+            node, j, phrase = trie, i, None
+            while j < n:
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if None in node:
+                    phrase = (node[None], j)
+            if phrase is not None:
+                term, i = phrase
+                unique_terms[term] = None
                 continue
 
-            if not text or text.strip() == '':
-                processed_row[field] = ''
+            term = words[i]
+            i += 1
+            if not self.normalizer.is_term(term):
                 continue
+            term = mapping.get(term, term)
+            if lookup is not None:
+                term = lookup.get(term.lower())
+                if term is None:
+                    continue
+            unique_terms[term] = None
 
-            # Normalize
-            normalized = self.normalizer.normalize(text)
-
-            # Extract terms
-            terms = self.normalizer.extract_terms(normalized)
-
-            # Apply standardization if available
-            if field in self.term_mappings:
-                terms = [
-                    self.term_mappings[field].get(term, term)
-                    for term in terms
-                ]
-
-            # Filter to only medical terms and standardize them
-            medical_terms = self.filter_and_standardize_medical_terms(terms, field)
-
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_terms = []
-            for term in medical_terms:
-                if term not in seen:
-                    seen.add(term)
-                    unique_terms.append(term)
-
-            # Format as comma-separated
-            processed_row[field] = ', '.join(unique_terms) if unique_terms else ''
-
-        return processed_row
+        # Format as comma-separated
+        return ', '.join(unique_terms)
 
     def preprocess_csv(
         self,
@@ -311,15 +541,21 @@ class VAERSPreprocessor:
         output_path: Path,
         year_filter: Optional[Set[int]] = None,
         encodings: Optional[List[str]] = None,
+        workers: Optional[int] = None,
     ):
         """
         Preprocess an entire CSV file.
 
+        Rows are read and written by this process; the text fields are preprocessed
+        in batches by a pool of worker processes (each row is independent once
+        term_mappings are built). Output row order matches the input.
+
         Args:
             input_path: Input CSV path
             output_path: Output CSV path
             year_filter: Years to include
             encodings: Encodings to try
+            workers: Worker processes (default: CPU count; 1 = preprocess in-process)
         """
         if encodings is None:
             encodings = ['utf-8', 'utf-8-sig', 'cp1252', 'latin1']
@@ -329,45 +565,106 @@ class VAERSPreprocessor:
         rows_written = 0
         rows_filtered = 0
 
-        # Get first row to determine fieldnames
-        first_row = None
-        for row in self.read_csv_with_encoding(input_path, encodings):
-            first_row = row
-            break
+        # Rows are lists; header positions are resolved once per file.
+        # csv.reader/csv.writer are kept over pyarrow.csv here: every text value has
+        # to become a Python str for preprocessing anyway (Arrow + to_pylist measured
+        # no faster), and csv.writer keeps the established output quoting
+        rows = iter(self.read_csv_rows_with_encoding(input_path, encodings))
+        fieldnames = next(rows, None)
 
-        if not first_row:
+        if not fieldnames:
             print("[ERROR] Could not read input CSV")
             return
 
-        fieldnames = list(first_row.keys())
+        width = len(fieldnames)
+        year_idx = fieldnames.index('YEAR') if 'YEAR' in fieldnames else None
+        text_cols = [(i, field) for i, field in enumerate(fieldnames) if field in TEXT_FIELDS]
+        text_fields = [field for _, field in text_cols]
+
+        def keep(row: List[str]) -> bool:
+            """Fit the row to the header width; False if excluded by the year filter."""
+            nonlocal rows_filtered
+            if _year_excluded(_fit_row(row, width), year_idx, year_filter):
+                rows_filtered += 1
+                return False
+            return True
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        def write_rows(batch: List[List[str]]):
+            nonlocal rows_written
+            writer.writerows(batch)
+            before = rows_written
+            rows_written += len(batch)
+            if rows_written // 10000 > before // 10000:
+                print(f"  Written {rows_written:,} rows...")
 
         # Write preprocessed data
-        with output_path.open('w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for row in self.read_csv_with_encoding(input_path, encodings):
-                # Apply year filter
-                if year_filter is not None:
-                    year_str = row.get('YEAR', '').strip()
-                    if year_str:
-                        try:
-                            year = int(float(year_str))
-                            if year not in year_filter:
-                                rows_filtered += 1
-                                continue
-                        except ValueError:
-                            pass
-
-                # Preprocess row
-                processed_row = self.preprocess_row(row)
-                writer.writerow(processed_row)
-                rows_written += 1
-
-                if rows_written % 10000 == 0:
-                    print(f"  Written {rows_written:,} rows...")
+        with output_path.open('w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_BYTES) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(fieldnames)
+
+            if workers <= 1:
+                preprocess = self._preprocess_cached
+                batch: List[List[str]] = []
+                for row in rows:
+                    if not keep(row):
+                        continue
+
+                    # Preprocess text fields in place
+                    for i, field in text_cols:
+                        row[i] = preprocess(field, row[i])
+                    batch.append(row)
+                    if len(batch) >= WRITE_BATCH_ROWS:
+                        write_rows(batch)
+                        batch = []
+
+                if batch:
+                    write_rows(batch)
+            else:
+                pending: deque = deque()  # (batch rows, future of processed text fields)
+
+                def submit(batch: List[List[str]]):
+                    # Only the text fields cross the process boundary
+                    texts = [[row[i] for i, _ in text_cols] for row in batch]
+                    pending.append((batch, pool.submit(_preprocess_batch, text_fields, texts)))
+
+                def flush_oldest():
+                    batch, future = pending.popleft()
+                    processed, lemmas = future.result()
+                    self.normalizer.add_lemmas(lemmas)
+                    for row, texts in zip(batch, processed):
+                        for (i, _), text in zip(text_cols, texts):
+                            row[i] = text
+                    write_rows(batch)
+
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(self._init_kwargs, self.term_mappings),
+                ) as pool:
+                    batch: List[List[str]] = []
+                    for row in rows:
+                        if not keep(row):
+                            continue
+
+                        batch.append(row)
+                        if len(batch) >= WORKER_BATCH_ROWS:
+                            submit(batch)
+                            batch = []
+                            # Bound memory: keep at most 2 batches in flight per worker
+                            if len(pending) >= 2 * workers:
+                                flush_oldest()
+
+                    if batch:
+                        submit(batch)
+                    while pending:
+                        flush_oldest()
 
         print(f"[INFO] Wrote {rows_written:,} rows (filtered {rows_filtered:,} by year)")
+        if workers <= 1:
+            print(f"[INFO] Text fields: {_cache_summary(self._preprocess_cached)}")
 
     def save_term_mappings(self, output_path: Path):
         """
@@ -379,12 +676,15 @@ class VAERSPreprocessor:
         print(f"[INFO] Saving term mappings to {output_path.name}")
 
         output_data = {
-            'field_stats': dict(self.field_stats),
+            'field_stats': {field: dict(stats) for field, stats in self.field_stats.items()},
             'term_mappings': self.term_mappings,
         }
 
-        with output_path.open('w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        else:
+            with output_path.open('w', encoding='utf-8') as f:
+                json.dump(output_data, f, indent=2)
 
         print(f"[OK] Saved term mappings")
 
@@ -397,14 +697,25 @@ class VAERSPreprocessor:
         """
         print(f"[INFO] Loading term mappings from {input_path.name}")
 
-        with input_path.open('r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(input_path.read_bytes())
+        else:
+            with input_path.open('r', encoding='utf-8') as f:
+                data = json.load(f)
 
         self.field_stats = defaultdict(lambda: defaultdict(int), data.get('field_stats', {}))
         self.term_mappings = data.get('term_mappings', {})
+        self._preprocess_cached.cache_clear()
 
         print(f"[OK] Loaded term mappings for {len(self.term_mappings)} fields")
 
+    def save_lemma_cache(self):
+        """Save the normalizer's lemmas to lemma_cache_path (if set) for the next run."""
+        if self.lemma_cache_path is None or not self.normalizer.use_lemmatization:
+            return
+        count = self.normalizer.save_lemma_cache(self.lemma_cache_path)
+        print(f"[OK] Saved {count:,} lemmas to {self.lemma_cache_path.name}")
+
     def print_statistics(self):
         """Print preprocessing statistics."""
         print("\n=== Preprocessing Statistics ===\n")
@@ -429,6 +740,36 @@ class VAERSPreprocessor:
             print()
 
 
+# ----------------------------
+# extract_field_terms / preprocess_csv worker processes
+# ----------------------------
+_WORKER: Optional[VAERSPreprocessor] = None
+
+
+def _init_worker(init_kwargs: Dict, term_mappings: Dict[str, Dict[str, str]]):
+    """Build this worker's preprocessor once (lookups, normalizer, term mappings)."""
+    global _WORKER
+    _WORKER = VAERSPreprocessor(**init_kwargs)
+    _WORKER.term_mappings = term_mappings
+    if init_kwargs.get('lemma_cache_path') is not None:
+        # New lemmas go back to the parent with each batch, so it can save them
+        _WORKER.normalizer.track_new_lemmas()
+
+
+def _extract_batch(
+    n_fields: int,
+    batch: List[List[str]],
+) -> Tuple[Tuple[List[Counter], List[int], List[int]], Dict[str, str]]:
+    """Count the terms of a batch of text-field value lists in a worker process (plus new lemmas)."""
+    return _count_terms(_WORKER._extract_cached, n_fields, batch), _WORKER.normalizer.take_new_lemmas()
+
+
+def _preprocess_batch(fields: List[str], batch: List[List[str]]) -> Tuple[List[List[str]], Dict[str, str]]:
+    """Preprocess a batch of text-field value lists (one value per field) in a worker process (plus new lemmas)."""
+    preprocess = _WORKER._preprocess_cached
+    processed = [[preprocess(field, text) for field, text in zip(fields, texts)] for texts in batch]
+    return processed, _WORKER.normalizer.take_new_lemmas()
+
 if __name__ == "__main__":
     # Example usage
     from pathlib import Path
@@ -461,3 +802,4 @@ if __name__ == "__main__":
     preprocessor.save_term_mappings(output_mappings)
 
     print("\n[OK] Preprocessing analysis complete")
+
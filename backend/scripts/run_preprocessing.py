@@ -41,16 +41,11 @@ def parse_years(years_str: Optional[str]) -> Optional[Set[int]]:
     if not years_str:
         return None
 
+    # Each part is a range: "2020-2024", or "2024" as the range 2024-2024
     years = set()
     for year_part in years_str.split(','):
-        year_part = year_part.strip()
-        if '-' in year_part:
-            # Range: 2020-2024
-            start, end = year_part.split('-')
-            years.update(range(int(start), int(end) + 1))
-        else:
-            # Single year
-            years.add(int(year_part))
+        start, sep, end = year_part.partition('-')
+        years.update(range(int(start), int(end if sep else start) + 1))
 
     return years
 
@@ -75,6 +70,7 @@ def cmd_analyze(args):
         min_term_frequency=args.min_freq,
         similarity_threshold=args.similarity,
         use_medical_filter=True,
+        lemma_cache_path=Path(args.lemma_cache) if args.lemma_cache else None,
     )
 
     # Extract terms
@@ -83,6 +79,7 @@ def cmd_analyze(args):
         input_path,
         year_filter=year_filter,
         encodings=args.encodings.split(',') if args.encodings else None,
+        workers=args.workers,
     )
 
     # Build standardization maps
@@ -99,6 +96,7 @@ def cmd_analyze(args):
         output_path = input_path.parent / "term_mappings.json"
 
     preprocessor.save_term_mappings(output_path)
+    preprocessor.save_lemma_cache()
 
     print(f"\n[OK] Analysis complete. Mappings saved to: {output_path}")
     return 0
@@ -128,6 +126,7 @@ def cmd_preprocess(args):
     preprocessor = VAERSPreprocessor(
         use_lemmatization=not args.no_lemmatization,
         use_medical_filter=True,
+        lemma_cache_path=Path(args.lemma_cache) if args.lemma_cache else None,
     )
     preprocessor.load_term_mappings(mappings_path)
 
@@ -138,7 +137,9 @@ def cmd_preprocess(args):
         output_path,
         year_filter=year_filter,
         encodings=args.encodings.split(',') if args.encodings else None,
+        workers=args.workers,
     )
+    preprocessor.save_lemma_cache()
 
     print(f"\n[OK] Preprocessing complete. Output saved to: {output_path}")
     return 0
@@ -166,6 +167,7 @@ def cmd_full(args):
         min_term_frequency=args.min_freq,
         similarity_threshold=args.similarity,
         use_medical_filter=True,
+        lemma_cache_path=Path(args.lemma_cache) if args.lemma_cache else None,
     )
 
     encodings = args.encodings.split(',') if args.encodings else None
@@ -176,6 +178,7 @@ def cmd_full(args):
         input_path,
         year_filter=year_filter,
         encodings=encodings,
+        workers=args.workers,
     )
 
     preprocessor.build_standardization_maps(field_frequencies)
@@ -192,7 +195,9 @@ def cmd_full(args):
         output_path,
         year_filter=year_filter,
         encodings=encodings,
+        workers=args.workers,
     )
+    preprocessor.save_lemma_cache()
 
     print(f"\n[OK] Full pipeline complete!")
     print(f"  Preprocessed data: {output_path}")
@@ -218,6 +223,8 @@ def main():
     analyze_parser.add_argument('--similarity', type=float, default=0.85, help='Similarity threshold for term matching (default: 0.85)')
     analyze_parser.add_argument('--no-lemmatization', action='store_true', help='Disable lemmatization')
     analyze_parser.add_argument('--encodings', default='utf-8,cp1252,latin1', help='Comma-separated encodings to try')
+    analyze_parser.add_argument('--workers', '-w', type=int, help='Worker processes (default: CPU count)')
+    analyze_parser.add_argument('--lemma-cache', help='JSON file of lemmas reused across runs (read if present, then updated)')
 
     # Preprocess command
     preprocess_parser = subparsers.add_parser('preprocess', help='Preprocess data using existing mappings')
@@ -227,6 +234,8 @@ def main():
     preprocess_parser.add_argument('--years', '-y', help='Comma-separated years to include')
     preprocess_parser.add_argument('--no-lemmatization', action='store_true', help='Disable lemmatization')
     preprocess_parser.add_argument('--encodings', default='utf-8,cp1252,latin1', help='Comma-separated encodings to try')
+    preprocess_parser.add_argument('--workers', '-w', type=int, help='Worker processes (default: CPU count)')
+    preprocess_parser.add_argument('--lemma-cache', help='JSON file of lemmas reused across runs (read if present, then updated)')
 
     # Full pipeline command
     full_parser = subparsers.add_parser('full', help='Run full pipeline: analyze + preprocess')
@@ -237,6 +246,8 @@ def main():
     full_parser.add_argument('--similarity', type=float, default=0.85, help='Similarity threshold for term matching (default: 0.85)')
     full_parser.add_argument('--no-lemmatization', action='store_true', help='Disable lemmatization')
     full_parser.add_argument('--encodings', default='utf-8,cp1252,latin1', help='Comma-separated encodings to try')
+    full_parser.add_argument('--workers', '-w', type=int, help='Worker processes (default: CPU count)')
+    full_parser.add_argument('--lemma-cache', help='JSON file of lemmas reused across runs (read if present, then updated)')
 
     args = parser.parse_args()
 
@@ -5,11 +5,69 @@ Handles medical text cleaning, lemmatization, and term standardization.
 """
 from __future__ import annotations
 
+import json
 import re
-from collections import Counter
-from typing import Dict, List, Set, Optional
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, Iterable, List, Set, Optional
 import string
 
+try:
+    from rapidfuzz import fuzz, process as rf_process
+except ImportError:  # pure-Python candidate filtering in create_term_standardization_map
+    rf_process = None  # type: ignore[assignment]
+
+
+# Fixed cleanup patterns, compiled once. Stdlib re is deliberate: on VAERS field
+# values google-re2 measured slower (per-call str->bytes overhead dominates), and
+# RE2-based kernels (e.g. pyarrow.compute) treat \w as ASCII, dropping accented letters
+URL_RE = re.compile(r'http\S+|www\.\S+')
+EMAIL_RE = re.compile(r'\S+@\S+')
+LOT_RE = re.compile(r'lot\s*#?\s*[A-Z0-9]+', re.IGNORECASE)
+CASE_RE = re.compile(r'case\s*#?\s*[A-Z0-9-]+', re.IGNORECASE)
+US_ID_RE = re.compile(r'us-\w+-\w+', re.IGNORECASE)
+PUNCT_RE = re.compile(r'[^\w\s-]')
+NON_WORD_RE = re.compile(r'[^\w\s]')
+DIGIT_RE = re.compile(r'\d')
+# PUNCT_RE as a byte table (punctuation -> space) for ASCII text: one C-level
+# table lookup per byte instead of a regex scan
+PUNCT_TABLE = bytes(0x20 if PUNCT_RE.match(chr(i)) else i for i in range(128)) + bytes(range(128, 256))
+
+# Max distinct raw texts remembered by TextNormalizer.normalize (oldest evicted first)
+NORMALIZE_CACHE_SIZE = 100_000
+
+# is_none_text: whole-text "none" answers, and words that make up a "none" phrase
+NONE_TEXTS = frozenset({'none', 'no', 'unk', 'unknown', 'n/a', 'na', 'nkda'})
+NONE_WORDS = frozenset({
+    'none', 'no', 'unk', 'unknown', 'na', 'not', 'known', 'reported', 'provided', 'nkda',
+    'allergies', 'allergy', 'drug', 'drugs', 'medication', 'medications', 'history', 'illness',
+})
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation matching any of `words`, shaped as a trie (shared prefixes
+    factored out) so each position is only tried against words with a matching
+    first character. Longer continuations come before ending at a node, so the
+    longest word wins, as in a longest-first flat alternation.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}  # a word ends here
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, Any]) -> str:
+    alts = [re.escape(ch) + _trie_node_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ''
+    if len(alts) == 1 and '' not in node:
+        return alts[0]
+    return '(?:' + '|'.join(alts) + ('|' if '' in node else '') + ')'
+
 
 class TextNormalizer:
     """
@@ -28,7 +86,14 @@ class TextNormalizer:
             use_lemmatization: Whether to use lemmatization (requires nltk)
         """
         self.use_lemmatization = use_lemmatization
-        self.lemmatizer = None
+        self.lemmatizer: Optional[Any] = None
+        # word -> lemma; VAERS reuses a small vocabulary, so WordNet is asked once per word
+        self._lemma_cache: Dict[str, str] = {}
+        # Lemmas computed since the last take_new_lemmas() (None = not tracked)
+        self._new_lemmas: Optional[Dict[str, str]] = None
+        # raw text -> normalize() result; short answers ("none", "unknown", ...) repeat
+        # across rows, fields and the analyze/preprocess passes
+        self._norm_cache: Dict[str, str] = {}
         self.stopwords = self._get_medical_stopwords()
 
         # Common medical abbreviations and their expansions
@@ -36,12 +101,7 @@ class TextNormalizer:
 
         # Dose-related patterns to remove (as requested)
         self.dose_patterns = [
-            r'\d+\s*mg\b',
-            r'\d+\s*mcg\b',
-            r'\d+\s*ml\b',
-            r'\d+\s*units?\b',
-            r'\d+\s*tabs?\b',
-            r'\d+\s*capsules?\b',
+            r'\d+\s*(?:mg|mcg|ml|units?|tabs?|capsules?)\b',  # 10mg, 5 mcg, 2 tabs, ...
             r'dose\s*\d+',
             r'q\d+h',  # q6h, q12h, etc.
         ]
@@ -56,10 +116,20 @@ class TextNormalizer:
         # Patterns for "none/unknown" detection
         self.none_patterns = self._get_none_patterns()
 
+        # Compiled once per normalizer; clean_text runs for every field of every row
+        # Dose (case-insensitive) and date removal fused into one scan
+        self._dose_date_re = re.compile('|'.join(
+            [f'(?i:{p})' for p in self.dose_patterns] + [f'(?:{p})' for p in self.date_patterns]
+        ))
+        self._none_re = re.compile('|'.join(self.none_patterns))
+        # All abbreviations in one trie-shaped alternation (longest match wins): a single
+        # scan instead of one re.sub each
+        self._abbrev_re = re.compile(r'\b' + _trie_pattern(self.medical_abbrevs) + r'\b')
+
         if use_lemmatization:
             self._init_lemmatizer()
 
-    def _init_lemmatizer(self):
+    def _init_lemmatizer(self) -> None:
         """Initialize NLTK lemmatizer (lazy load)."""
         try:
             import nltk
@@ -168,37 +238,43 @@ class TextNormalizer:
 
         text = str(text)
 
-        # Remove dose information (as requested)
-        for pattern in self.dose_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-
-        # Remove dates (as requested)
-        for pattern in self.date_patterns:
-            text = re.sub(pattern, '', text)
+        # Remove dose information and dates (as requested); all need a digit,
+        # so the scan is skipped without one
+        if DIGIT_RE.search(text):
+            text = self._dose_date_re.sub('', text)
 
         # Convert to lowercase
         text = text.lower()
 
         # Expand common medical abbreviations
-        for abbrev, expansion in self.medical_abbrevs.items():
-            text = re.sub(r'\b' + abbrev + r'\b', expansion, text)
+        text = self._abbrev_re.sub(lambda m: self.medical_abbrevs[m.group(0)], text)
+
+        # Each removal below is skipped when the text lacks a literal its pattern
+        # requires (one C-level scan instead of a regex pass)
 
         # Remove URLs, emails
-        text = re.sub(r'http\S+|www\.\S+', '', text)
-        text = re.sub(r'\S+@\S+', '', text)
+        if 'http' in text or 'www.' in text:
+            text = URL_RE.sub('', text)
+        if '@' in text:
+            text = EMAIL_RE.sub('', text)
 
         # Remove lot numbers, case IDs, etc.
-        text = re.sub(r'lot\s*#?\s*[A-Z0-9]+', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'case\s*#?\s*[A-Z0-9-]+', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'us-\w+-\w+', '', text, flags=re.IGNORECASE)
+        if 'lot' in text:
+            text = LOT_RE.sub('', text)
+        if 'ca' in text:
+            text = CASE_RE.sub('', text)
+        if '-' in text:
+            text = US_ID_RE.sub('', text)
 
         # Remove extra punctuation but keep hyphens in compound terms
-        text = re.sub(r'[^\w\s-]', ' ', text)
-
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        if text.isascii():
+            text = text.encode('ascii').translate(PUNCT_TABLE).decode('ascii')
+        else:
+            text = PUNCT_RE.sub(' ', text)
 
-        return text.strip()
+        # Normalize whitespace (str.split() uses the same Unicode whitespace as \s,
+        # and collapses + strips in one C pass)
+        return ' '.join(text.split())
 
     def lemmatize_text(self, text: str) -> str:
         """
@@ -213,10 +289,57 @@ class TextNormalizer:
         if not self.use_lemmatization or not self.lemmatizer:
             return text
 
-        words = text.split()
-        lemmatized = [self.lemmatizer.lemmatize(word) for word in words]
+        cache = self._lemma_cache
+        lemmatized = []
+        for word in text.split():
+            lemma = cache.get(word)
+            if lemma is None:
+                lemma = cache[word] = self.lemmatizer.lemmatize(word)
+                if self._new_lemmas is not None:
+                    self._new_lemmas[word] = lemma
+            lemmatized.append(lemma)
         return ' '.join(lemmatized)
 
+    def load_lemma_cache(self, path: Path) -> int:
+        """
+        Load word -> lemma pairs written by save_lemma_cache() (missing file = nothing loaded).
+
+        Returns:
+            Number of lemmas loaded
+        """
+        if not path.exists():
+            return 0
+        with path.open('r', encoding='utf-8') as f:
+            lemmas = json.load(f)
+        self._lemma_cache.update(lemmas)
+        return len(lemmas)
+
+    def save_lemma_cache(self, path: Path) -> int:
+        """
+        Save every word -> lemma pair seen so far, for load_lemma_cache() in a later run.
+
+        Returns:
+            Number of lemmas saved
+        """
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(self._lemma_cache, f)
+        return len(self._lemma_cache)
+
+    def track_new_lemmas(self) -> None:
+        """Start recording newly computed lemmas for take_new_lemmas()."""
+        self._new_lemmas = {}
+
+    def take_new_lemmas(self) -> Dict[str, str]:
+        """Lemmas computed since the last call (empty unless track_new_lemmas() was called)."""
+        new = self._new_lemmas or {}
+        if self._new_lemmas is not None:
+            self._new_lemmas = {}
+        return new
+
+    def add_lemmas(self, lemmas: Dict[str, str]) -> None:
+        """Add word -> lemma pairs (e.g. computed by a worker process's normalizer)."""
+        self._lemma_cache.update(lemmas)
+
     def extract_terms(self, text: str, min_length: int = 3) -> List[str]:
         """
         Extract meaningful medical terms from text.
@@ -231,18 +354,21 @@ class TextNormalizer:
         if not text:
             return []
 
-        # Split on whitespace
-        words = text.split()
+        # Split on whitespace, filter stopwords and short terms
+        return [word for word in text.split() if self.is_term(word, min_length)]
 
-        # Filter stopwords and short terms
-        terms = [
-            word for word in words
-            if len(word) >= min_length
-            and word not in self.stopwords
-            and not word.isdigit()
-        ]
+    def is_term(self, word: str, min_length: int = 3) -> bool:
+        """
+        Check if a normalized word is kept as a term by extract_terms.
+
+        Args:
+            word: Single normalized word
+            min_length: Minimum term length
 
-        return terms
+        Returns:
+            True if the word is long enough, not a stopword and not a number
+        """
+        return len(word) >= min_length and word not in self.stopwords and not word.isdigit()
 
     def is_none_text(self, text: Optional[str]) -> bool:
         """
@@ -254,29 +380,26 @@ class TextNormalizer:
         Returns:
             True if text indicates no information
         """
-        if not text or text.strip() == '':
+        text_lower = text.lower().strip() if text else ''
+        if not text_lower:
             return True
 
-        text_lower = text.lower().strip()
-
         # Check for exact matches
-        if text_lower in ['none', 'no', 'unk', 'unknown', 'n/a', 'na', 'nkda']:
+        if text_lower in NONE_TEXTS:
             return True
 
-        # Check patterns
-        for pattern in self.none_patterns:
-            if re.search(pattern, text_lower):
-                # Make sure it's not part of a longer medical term
-                # Check if the entire cleaned text is just the "none" phrase
-                cleaned_words = re.sub(r'[^\w\s]', ' ', text_lower).split()
-                none_words = {'none', 'no', 'unk', 'unknown', 'na', 'not', 'known', 'reported', 'provided', 'nkda', 'allergies', 'allergy', 'drug', 'drugs', 'medication', 'medications', 'history', 'illness'}
-                # If most words are "none" indicators, consider it empty
-                if len(cleaned_words) > 0:
-                    none_count = sum(1 for word in cleaned_words if word in none_words)
-                    if none_count >= len(cleaned_words) * 0.7:  # 70% threshold
-                        return True
-
-        return False
+        # Check patterns (one alternation)
+        if not self._none_re.search(text_lower):
+            return False
+
+        # Make sure it's not part of a longer medical term:
+        # if most words are "none" indicators, consider it empty
+        # (NON_WORD_RE is Unicode-aware and benchmarks faster than str.translate here)
+        cleaned_words = NON_WORD_RE.sub(' ', text_lower).split()
+        if not cleaned_words:
+            return False
+        none_count = sum(1 for word in cleaned_words if word in NONE_WORDS)
+        return none_count >= len(cleaned_words) * 0.7  # 70% threshold
 
     def normalize(self, text: Optional[str]) -> str:
         """
@@ -291,6 +414,11 @@ class TextNormalizer:
         if not text:
             return ''
 
+        cache = self._norm_cache
+        cached = cache.get(text)
+        if cached is not None:
+            return cached
+
         # Clean
         cleaned = self.clean_text(text)
 
@@ -298,6 +426,9 @@ class TextNormalizer:
         if self.use_lemmatization:
             cleaned = self.lemmatize_text(cleaned)
 
+        if len(cache) >= NORMALIZE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[text] = cleaned
         return cleaned
 
     def extract_unique_terms(self, texts: List[str], min_frequency: int = 2) -> Dict[str, int]:
@@ -331,7 +462,8 @@ class TextNormalizer:
 
 def create_term_standardization_map(
     term_frequencies: Dict[str, int],
-    similarity_threshold: float = 0.85
+    similarity_threshold: float = 0.85,
+    fixed_terms: Optional[AbstractSet[str]] = None,
 ) -> Dict[str, str]:
     """
     Create a mapping of variant terms to standardized terms.
@@ -340,6 +472,8 @@ def create_term_standardization_map(
     Args:
         term_frequencies: Dictionary of term -> frequency
         similarity_threshold: Similarity threshold for matching (0-1)
+        fixed_terms: Terms that are never mapped to another term (e.g. curated
+            dictionary terms); they can still be the standard for other terms
 
     Returns:
         Dictionary mapping variant -> standard term
@@ -350,11 +484,28 @@ def create_term_standardization_map(
         print("[WARN] difflib not available. Skipping fuzzy matching.")
         return {}
 
+    fixed_terms = fixed_terms or set()
+
     # Sort terms by frequency (most common first)
     sorted_terms = sorted(term_frequencies.items(), key=lambda x: x[1], reverse=True)
 
     standardization_map = {}
     processed = set()
+    # Terms that may still become a variant, in frequency order
+    remaining = [term for term, _ in sorted_terms if term not in fixed_terms]
+    # rapidfuzz scores are 0-100; the margin keeps float rounding from dropping a match
+    cutoff = similarity_threshold * 100 - 1e-6
+    compacted_at = 0
+
+    # Pure-Python path: candidates bucketed by length, so the length bound
+    # (SequenceMatcher.real_quick_ratio) rules out whole buckets at once
+    rank = {term: i for i, (term, _) in enumerate(sorted_terms)}
+    by_length: Dict[int, List[str]] = defaultdict(list)
+    if rf_process is None:
+        for term in remaining:
+            by_length[len(term)].append(term)
+    # Character multisets for the quick_ratio bound below
+    char_counts: Dict[str, Counter] = {term: Counter(term) for term in remaining} if rf_process is None else {}
 
     for term, freq in sorted_terms:
         if term in processed:
@@ -364,8 +515,37 @@ def create_term_standardization_map(
         standard_term = term
         processed.add(term)
 
-        # Find similar terms
-        for other_term, other_freq in sorted_terms:
+        if rf_process is not None:
+            # Indel similarity (fuzz.ratio) is an upper bound on SequenceMatcher.ratio,
+            # so this C-level scan returns every match (and some non-matches)
+            hits = rf_process.extract(term, remaining, scorer=fuzz.ratio, score_cutoff=cutoff, limit=None)
+            candidates = [other_term for other_term, _, _ in sorted(hits, key=lambda hit: hit[2])]
+
+            # Drop processed terms from the candidates once enough have piled up
+            if len(processed) - compacted_at > len(remaining) // 2:
+                remaining = [other_term for other_term in remaining if other_term not in processed]
+                compacted_at = len(processed)
+        else:
+            term_counts = Counter(term)
+            candidates = []
+            for length, bucket in by_length.items():
+                total = len(term) + length
+                if 2.0 * min(len(term), length) / total < similarity_threshold:
+                    continue
+                live = []
+                for other_term in bucket:
+                    if other_term in processed:
+                        continue
+                    live.append(other_term)
+                    # Upper bound on the ratio (SequenceMatcher.quick_ratio)
+                    common = sum((term_counts & char_counts[other_term]).values())
+                    if 2.0 * common / total >= similarity_threshold:
+                        candidates.append(other_term)
+                by_length[length] = live
+            candidates.sort(key=rank.__getitem__)
+
+        # Confirm candidates with difflib, in frequency order
+        for other_term in candidates:
             if other_term in processed:
                 continue
 
@@ -1,26 +1,88 @@
 # backend/services/cache.py
 from __future__ import annotations
 
+import heapq
 import json
 import os
 import threading
 import time
+import weakref
 from dataclasses import dataclass
-from hashlib import sha256
+from hashlib import blake2b
 from typing import Any, Callable, Dict, Optional, Tuple
 
+import orjson
+
+try:
+    import xxhash
+except ImportError:  # stable_hash falls back to hashlib's BLAKE2b
+    xxhash = None
+
+# Digest behind stable_hash (keys only live in-process, so any fast 128-bit hash works)
+HASH_ALGO = "xxh3_128" if xxhash is not None else "blake2b"
+
+
+# get_or_set single-flight locks: keys share a fixed set of lock stripes
+_LOCK_STRIPES = 64
+
+# Default shard count for ShardedTTLCache (rounded up to a power of two)
+_DEFAULT_SHARDS = 16
+
 
 def _now() -> float:
     return time.time()
 
 
+def _sweep_interval(default_ttl: int) -> float:
+    return max(min(default_ttl / 4, 5.0), 0.1)
+
+
+def _sweep_loop(ref: "weakref.ref[Any]", interval: float) -> None:
+    """
+    Background expiry sweeper. Holds only a weak reference, so the thread
+    exits once its cache is garbage collected.
+    """
+    while True:
+        time.sleep(interval)
+        cache = ref()
+        if cache is None:
+            return
+        cache.sweep_expired()
+        del cache
+
+
+def _start_sweeper(cache: Any, interval: float) -> None:
+    threading.Thread(
+        target=_sweep_loop,
+        args=(weakref.ref(cache), interval),
+        name="ttlcache-sweeper",
+        daemon=True,
+    ).start()
+
+
+def hash_bytes(payload: bytes) -> str:
+    """
+    Hex digest (HASH_ALGO) of bytes that are already a canonical key,
+    e.g. a raw query string; skips stable_hash's serialization.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(payload)
+    return blake2b(payload, digest_size=16).hexdigest()
+
+
 def stable_hash(obj: Any) -> str:
     """
     Hash arbitrary JSON-serializable objects in a stable way.
     Useful for caching request args / filter dicts.
+    Keys only live in this process, so a fast non-cryptographic 128-bit digest
+    is enough (HASH_ALGO); orjson serializes ~10x faster than json (stdlib json
+    covers what orjson rejects, e.g. ints beyond 64 bits).
     """
-    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
-    return sha256(payload).hexdigest()
+    try:
+        payload = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    except TypeError:
+        payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hash_bytes(payload)
 
 
 @dataclass
@@ -36,6 +98,7 @@ class CacheStats:
     sets: int = 0
     evicted_expired: int = 0
     evicted_overflow: int = 0
+    rejected_admission: int = 0
 
 
 def _env_bool(name: str, default: bool = True) -> bool:
@@ -60,9 +123,17 @@ class TTLCache:
     """
     Simple in-memory TTL cache.
 
-    - Thread-safe via a single lock.
+    - Thread-safe: writes take a single lock; get() is lock-free.
+    - Expired entries are removed by a background sweeper thread (every
+      default_ttl/4 seconds, at most 5s) rather than on the request path;
+      get() never returns an expired value either way.
     - Supports get/set and get_or_set (compute on miss).
-    - get_or_set uses a per-key lock to avoid duplicate recomputation ("single flight").
+    - When full, a new key that would expire before every resident entry is not
+      admitted (it would be the next eviction anyway), so short-TTL values don't
+      push out long-lived ones.
+    - get_or_set uses a per-key lock stripe to avoid duplicate recomputation ("single flight").
+    - Values are stored by reference, not copied: callers must not mutate them
+      (immutable values such as serialized response bytes are safest).
     """
 
     def __init__(
@@ -70,6 +141,7 @@ class TTLCache:
         default_ttl_seconds: int = 30,
         max_items: int = 256,
         enabled: bool = True,
+        background_sweep: bool = True,
     ):
         self.default_ttl = int(default_ttl_seconds)
         self.max_items = int(max_items)
@@ -78,36 +150,69 @@ class TTLCache:
         self._lock = threading.Lock()
         self._store: Dict[str, CacheEntry] = {}
         self._stats = CacheStats()
+        # (expires_at, key) min-heap; entries for overwritten/removed keys are
+        # skipped lazily when they surface
+        self._expiry_heap: list[Tuple[float, str]] = []
+
+        # Lock stripes for get_or_set single-flight (bounded, unlike one lock per key)
+        self._key_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
 
-        # Per-key locks for get_or_set single-flight
-        self._key_locks: Dict[str, threading.Lock] = {}
-        self._key_locks_lock = threading.Lock()
+        if self.enabled and background_sweep:
+            _start_sweeper(self, _sweep_interval(self.default_ttl))
 
     def stats(self) -> CacheStats:
         # return a copy so callers can’t mutate internal stats
         with self._lock:
             return CacheStats(**self._stats.__dict__)
 
+    def _pop_earliest_locked(self) -> bool:
+        """
+        Pop the earliest heap entry; remove its key if the entry is still current.
+        Returns True if a live entry was removed.
+        """
+        expires_at, k = heapq.heappop(self._expiry_heap)
+        ent = self._store.get(k)
+        if ent is None or ent.expires_at != expires_at:
+            return False  # stale: key was overwritten or already removed
+        del self._store[k]
+        return True
+
     def _evict_expired_locked(self) -> None:
         t = _now()
-        expired_keys = [k for k, v in self._store.items() if v.expires_at <= t]
-        for k in expired_keys:
-            self._store.pop(k, None)
-        if expired_keys:
-            self._stats.evicted_expired += len(expired_keys)
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= t:
+            if self._pop_earliest_locked():
+                self._stats.evicted_expired += 1
+
+    def _earliest_expiry_locked(self) -> Optional[float]:
+        """
+        Expiry of the soonest-expiring live entry (drops stale heap roots first).
+        """
+        heap = self._expiry_heap
+        while heap:
+            expires_at, k = heap[0]
+            ent = self._store.get(k)
+            if ent is not None and ent.expires_at == expires_at:
+                return expires_at
+            heapq.heappop(heap)
+        return None
 
     def _evict_overflow_locked(self) -> None:
         """
         If we exceed max_items, evict earliest-expiring items first.
         """
-        if len(self._store) <= self.max_items:
+        while len(self._store) > self.max_items and self._expiry_heap:
+            if self._pop_earliest_locked():
+                self._stats.evicted_overflow += 1
+
+    def sweep_expired(self) -> None:
+        """
+        Remove expired entries (called by the background sweeper).
+        """
+        if not self.enabled:
             return
-        items: list[Tuple[str, CacheEntry]] = sorted(self._store.items(), key=lambda kv: kv[1].expires_at)
-        over = len(items) - self.max_items
-        for i in range(over):
-            self._store.pop(items[i][0], None)
-        if over > 0:
-            self._stats.evicted_overflow += over
+        with self._lock:
+            self._evict_expired_locked()
 
     def prune(self) -> None:
         """
@@ -123,32 +228,43 @@ class TTLCache:
     def get(self, key: str) -> Optional[Any]:
         if not self.enabled:
             return None
-        with self._lock:
-            self._evict_expired_locked()
-            ent = self._store.get(key)
-            if not ent:
-                self._stats.misses += 1
-                return None
-            if ent.expires_at <= _now():
-                self._store.pop(key, None)
-                self._stats.misses += 1
-                return None
-            self._stats.hits += 1
-            return ent.value
+        # Lock-free read: a dict lookup is atomic and entries are replaced, never
+        # mutated, so a reader sees either the old or the new entry. Expired entries
+        # are left for the background sweeper. (Hit/miss counts are not locked,
+        # so they are approximate under concurrent reads.)
+        ent = self._store.get(key)
+        if ent is None or ent.expires_at <= _now():
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return ent.value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         if not self.enabled:
             return
         ttl = self.default_ttl if ttl_seconds is None else int(ttl_seconds)
         with self._lock:
-            self._evict_expired_locked()
-            self._store[key] = CacheEntry(expires_at=_now() + ttl, value=value)
+            expires_at = _now() + ttl
+            # Admission (TTL_min): when full, a new key that would expire before every
+            # resident entry would only be evicted right away, so don't insert it
+            if key not in self._store and len(self._store) >= self.max_items:
+                earliest = self._earliest_expiry_locked()
+                if earliest is not None and expires_at < earliest:
+                    self._stats.rejected_admission += 1
+                    return
+            self._store[key] = CacheEntry(expires_at=expires_at, value=value)
+            heapq.heappush(self._expiry_heap, (expires_at, key))
             self._stats.sets += 1
             self._evict_overflow_locked()
+            # Rebuild once overwritten keys leave the heap mostly stale
+            if len(self._expiry_heap) > 2 * max(len(self._store), self.max_items):
+                self._expiry_heap = [(e.expires_at, k) for k, e in self._store.items()]
+                heapq.heapify(self._expiry_heap)
 
     def clear(self) -> None:
         with self._lock:
             self._store.clear()
+            self._expiry_heap.clear()
 
     def size(self) -> int:
         if not self.enabled:
@@ -159,14 +275,10 @@ class TTLCache:
 
     def _get_key_lock(self, key: str) -> threading.Lock:
         """
-        Get (or create) a per-key lock for get_or_set.
+        Get the lock stripe for a key (used by get_or_set).
+        A key always maps to the same stripe; unrelated keys may share one.
         """
-        with self._key_locks_lock:
-            lk = self._key_locks.get(key)
-            if lk is None:
-                lk = threading.Lock()
-                self._key_locks[key] = lk
-            return lk
+        return self._key_locks[hash(key) % _LOCK_STRIPES]
 
     def get_or_set(
         self,
@@ -177,7 +289,7 @@ class TTLCache:
         """
         Return cached value if present; otherwise compute and cache it.
 
-        Uses a per-key lock so that under concurrent requests,
+        Uses a per-key lock stripe so that under concurrent requests,
         only one thread computes the value for a given key.
         """
         existing = self.get(key)
@@ -197,15 +309,99 @@ class TTLCache:
             return value
 
 
+class ShardedTTLCache:
+    """
+    TTLCache split into independent shards, each with its own lock, store and
+    expiry heap, so concurrent writers to different keys rarely contend.
+
+    - Same interface as TTLCache; a key always routes to the same shard.
+    - The shard count is rounded up to a power of two (routing is a bitmask).
+    - max_items is split evenly across shards, so overflow eviction is per shard
+      (earliest-expiring within the shard, not globally).
+    - One background sweeper thread serves all shards.
+    """
+
+    def __init__(
+        self,
+        default_ttl_seconds: int = 30,
+        max_items: int = 256,
+        enabled: bool = True,
+        shards: int = _DEFAULT_SHARDS,
+        background_sweep: bool = True,
+    ):
+        n = 1
+        while n < max(int(shards), 1):
+            n <<= 1
+        self.default_ttl = int(default_ttl_seconds)
+        self.max_items = int(max_items)
+        self.enabled = bool(enabled)
+
+        self._mask = n - 1
+        per_shard = -(-self.max_items // n)  # ceil
+        self._shards = [
+            TTLCache(
+                default_ttl_seconds=self.default_ttl,
+                max_items=per_shard,
+                enabled=self.enabled,
+                background_sweep=False,
+            )
+            for _ in range(n)
+        ]
+
+        if self.enabled and background_sweep:
+            _start_sweeper(self, _sweep_interval(self.default_ttl))
+
+    def _shard(self, key: str) -> TTLCache:
+        return self._shards[hash(key) & self._mask]
+
+    def stats(self) -> CacheStats:
+        total = CacheStats()
+        for shard in self._shards:
+            for name, n in shard.stats().__dict__.items():
+                setattr(total, name, getattr(total, name) + n)
+        return total
+
+    def sweep_expired(self) -> None:
+        for shard in self._shards:
+            shard.sweep_expired()
+
+    def prune(self) -> None:
+        for shard in self._shards:
+            shard.prune()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._shard(key).get(key)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        self._shard(key).set(key, value, ttl_seconds=ttl_seconds)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def size(self) -> int:
+        return sum(shard.size() for shard in self._shards)
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl_seconds: Optional[int] = None,
+    ) -> Any:
+        return self._shard(key).get_or_set(key, compute, ttl_seconds=ttl_seconds)
+
+
 # Global cache instance for dev (shared in-process)
 # You can override with env:
 #   CACHE_ENABLED=0
 #   CACHE_DEFAULT_TTL_SECONDS=300
 #   CACHE_MAX_ITEMS=2048
-CACHE = TTLCache(
+#   CACHE_SHARDS=16
+CACHE = ShardedTTLCache(
     default_ttl_seconds=_env_int("CACHE_DEFAULT_TTL_SECONDS", 45),
     max_items=_env_int("CACHE_MAX_ITEMS", 2048),
     enabled=_env_bool("CACHE_ENABLED", True),
+    shards=_env_int("CACHE_SHARDS", _DEFAULT_SHARDS),
 )
 
 
@@ -251,6 +447,13 @@ def main() -> None:
     print("[TEST] get_or_set stable:", v1 == v2, v1)
 
     print("[TEST] stats:", cache.stats())
+
+    # sharded cache routes each key to one shard
+    sharded = ShardedTTLCache(default_ttl_seconds=10, max_items=256, shards=3)
+    for i in range(32):
+        sharded.set(f"s{i}", i)
+    print("[TEST] sharded shards/size:", len(sharded._shards), sharded.size())
+    print("[TEST] sharded get s7:", sharded.get("s7"))
     print("[OK] cache self-test complete.")
 
 
@@ -1,12 +1,18 @@
 # backend/services/filters.py
 from __future__ import annotations
 
+import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl
 
 from flask import Request
 
+SERIOUS_FLAGS = ("DIED", "HOSPITAL", "L_THREAT", "DISABLE", "BIRTH_DEFECT")
+
 
 def _parse_int(x: Optional[str]) -> Optional[int]:
     if x is None:
@@ -43,16 +49,47 @@ def _parse_date_yyyy_mm_dd(x: Optional[str]) -> Optional[datetime]:
     if not x:
         return None
     try:
+        # Fast path for the canonical form; strptime still handles the rest
+        # (e.g. unpadded "2023-1-5")
+        if len(x) == 10 and x[4] == "-" and x[7] == "-":
+            y, mo, d = x[0:4], x[5:7], x[8:10]
+            if (y + mo + d).isdigit():
+                return datetime(int(y), int(mo), int(d))
         return datetime.strptime(x, "%Y-%m-%d")
     except ValueError:
         return None
 
 
+@lru_cache(maxsize=1024)
+def _substring_pattern(needle: str) -> str:
+    """
+    Escaped regex for a literal substring search. User text is never a pattern:
+    metacharacters match themselves and can't trigger catastrophic backtracking.
+    """
+    return re.escape(needle)
+
+
+def _substring_match(needle: str) -> Dict[str, Any]:
+    return {"$regex": _substring_pattern(needle), "$options": "i"}
+
+
 def _truthy(x: Optional[str]) -> bool:
     return (x or "").strip().lower() in ("1", "true", "yes", "y", "on")
 
 
-@dataclass(frozen=True)
+def _tristate(x: Optional[str]) -> Optional[bool]:
+    """
+    "true" -> True, "false" -> False, anything else -> None (no constraint).
+    """
+    v = (x or "").strip().lower()
+    if v == "true":
+        return True
+    if v == "false":
+        return False
+    return None
+
+
+@dataclass(frozen=True, slots=True)
 class FilterSpec:
     """
     Parsed filter options from request args.
@@ -72,6 +109,11 @@ class FilterSpec:
     died_only: bool = False
     hospital_only: bool = False
 
+    # UI toggles: True -> flag == "Y", False -> flag != "Y", None -> ignored
+    died: Optional[bool] = None
+    hospital: Optional[bool] = None
+    non_serious_only: bool = False         # serious_only=false: no serious flag set
+
     # Medical history filters
     other_meds: Optional[str] = None       # OTHER_MEDS field
     cur_ill: Optional[str] = None          # CUR_ILL field
@@ -86,18 +128,19 @@ class FilterSpec:
     symptom_text: Optional[str] = None     # free-text SYMPTOM_TEXT (expensive)
 
 
-def from_request(req: Request) -> FilterSpec:
-    args = req.args
-
+def _spec_from_args(args: Mapping[str, str]) -> FilterSpec:
     year = _parse_int(args.get("year"))
 
+    # Small fixed-vocabulary codes are interned so every spec shares one string object
     sex = (args.get("sex") or "").strip().upper() or None
     if sex not in (None, "M", "F", "U"):
         sex = None
+    sex = sys.intern(sex) if sex else None
 
     state = (args.get("state") or "").strip().upper() or None
     if state is not None and len(state) != 2:
         state = None
+    state = sys.intern(state) if state else None
 
     age_min = _parse_float(args.get("age_min"))
     age_max = _parse_float(args.get("age_max"))
@@ -109,6 +152,10 @@ def from_request(req: Request) -> FilterSpec:
     died_only = _truthy(args.get("died_only"))
     hospital_only = _truthy(args.get("hospital_only"))
 
+    died = _tristate(args.get("died"))
+    hospital = _tristate(args.get("hospital"))
+    non_serious_only = _tristate(args.get("serious_only")) is False
+
     # Medical history filters (case-insensitive substring search)
     other_meds = (args.get("other_meds") or "").strip() or None
     cur_ill = (args.get("cur_ill") or "").strip() or None
@@ -117,6 +164,7 @@ def from_request(req: Request) -> FilterSpec:
     allergies = (args.get("allergies") or "").strip() or None
 
     vax_type = (args.get("vax_type") or "").strip().upper() or None
+    vax_type = sys.intern(vax_type) if vax_type else None
     vax_manu = (args.get("vax_manu") or "").strip() or None
 
     symptom_term = (args.get("symptom_term") or "").strip() or None
@@ -133,6 +181,9 @@ def from_request(req: Request) -> FilterSpec:
         serious_only=serious_only,
         died_only=died_only,
         hospital_only=hospital_only,
+        died=died,
+        hospital=hospital,
+        non_serious_only=non_serious_only,
         other_meds=other_meds,
         cur_ill=cur_ill,
         history=history,
@@ -145,6 +196,23 @@ def from_request(req: Request) -> FilterSpec:
     )
 
 
+@lru_cache(maxsize=2048)
+def _parse_filters(qs: bytes) -> FilterSpec:
+    """
+    Parse a raw query string into a FilterSpec.
+    Pure function of the bytes, so identical URLs (dashboard refreshes) hit the cache.
+    First value wins for repeated keys, matching request.args.get().
+    """
+    args: Dict[str, str] = {}
+    for k, v in parse_qsl(qs.decode("utf-8", "replace"), keep_blank_values=True):
+        args.setdefault(k, v)
+    return _spec_from_args(args)
+
+
+def from_request(req: Request) -> FilterSpec:
+    return _parse_filters(req.query_string)
+
+
 def build_vaers_data_match(f: FilterSpec) -> Dict[str, Any]:
     """
     Build a MongoDB $match dict for vaers_data.
@@ -193,17 +261,26 @@ def build_vaers_data_match(f: FilterSpec) -> Dict[str, Any]:
     if f.hospital_only:
         m["HOSPITAL"] = "Y"
 
+    # UI toggles (applied last so they take precedence, as the endpoints used to)
+    if f.died is not None:
+        m["DIED"] = "Y" if f.died else {"$ne": "Y"}
+    if f.hospital is not None:
+        m["HOSPITAL"] = "Y" if f.hospital else {"$ne": "Y"}
+    if f.non_serious_only:
+        for flag in SERIOUS_FLAGS:
+            m[flag] = {"$ne": "Y"}
+
     # Medical history filters (case-insensitive substring search)
     if f.other_meds:
-        m["OTHER_MEDS"] = {"$regex": f.other_meds, "$options": "i"}
+        m["OTHER_MEDS"] = _substring_match(f.other_meds)
     if f.cur_ill:
-        m["CUR_ILL"] = {"$regex": f.cur_ill, "$options": "i"}
+        m["CUR_ILL"] = _substring_match(f.cur_ill)
     if f.history:
-        m["HISTORY"] = {"$regex": f.history, "$options": "i"}
+        m["HISTORY"] = _substring_match(f.history)
     if f.prior_vax:
-        m["PRIOR_VAX"] = {"$regex": f.prior_vax, "$options": "i"}
+        m["PRIOR_VAX"] = _substring_match(f.prior_vax)
     if f.allergies:
-        m["ALLERGIES"] = {"$regex": f.allergies, "$options": "i"}
+        m["ALLERGIES"] = _substring_match(f.allergies)
 
     return m
 
@@ -232,14 +309,17 @@ def build_filters(req: Request) -> Tuple[FilterSpec, Dict[str, Any], Dict[str, A
 def main() -> None:
     """
     Quick self-test without running Flask:
-    Creates a fake "args" dict and prints matches.
+    Creates a fake request with a query string and prints matches.
 
     Run:
       python backend/services/filters.py
     """
+    from urllib.parse import urlencode
+
     class _FakeReq:
         def __init__(self, args: Dict[str, str]):
             self.args = args
+            self.query_string = urlencode(args).encode("utf-8")
 
     fake = _FakeReq(
         {
@@ -251,6 +331,7 @@ def main() -> None:
             "onset_start": "2023-01-01",
             "onset_end": "2023-12-31",
             "serious_only": "true",
+            "hospital": "false",
             "vax_type": "COVID19",
             "symptom_term": "Headache",
         }
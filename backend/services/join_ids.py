@@ -0,0 +1,48 @@
+# backend/services/join_ids.py
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.db.mongo import get_db
+
+
+def get_join_ids(join_filters: Dict[str, Any]) -> Optional[Set[int]]:
+    """
+    VAERS_IDs satisfying the vax/symptom join filters (None if neither is set).
+    The two sides live in separate collections with their own indexes, so when
+    both are set they are fetched concurrently and intersected in Python.
+    """
+    db = get_db()
+
+    vax_type = join_filters.get("vax_type")
+    vax_manu = join_filters.get("vax_manu")
+    symptom_term = join_filters.get("symptom_term")
+
+    fetches: List[Tuple[str, Dict[str, Any]]] = []
+    if vax_type or vax_manu:
+        vax_match: Dict[str, Any] = {}
+        if vax_type: vax_match["VAX_TYPE"] = vax_type
+        if vax_manu: vax_match["VAX_MANU"] = vax_manu
+        fetches.append(("vaers_vax", vax_match))
+    if symptom_term:
+        # SYMPTOMS = merged SYMPTOM1-5 array (see db/indexes.py)
+        fetches.append(("vaers_symptoms", {"SYMPTOMS": symptom_term.strip()}))
+
+    if not fetches:
+        return None
+
+    def _ids(fetch: Tuple[str, Dict[str, Any]]) -> Set[int]:
+        coll_name, match = fetch
+        return set(
+            doc["VAERS_ID"]
+            for doc in db[coll_name].find(match, {"_id": 0, "VAERS_ID": 1})
+            if doc.get("VAERS_ID") is not None
+        )
+
+    if len(fetches) == 1:
+        return _ids(fetches[0])
+
+    with ThreadPoolExecutor(max_workers=len(fetches)) as ex:
+        id_sets = list(ex.map(_ids, fetches))
+    return set.intersection(*id_sets)
@@ -0,0 +1,30 @@
+# backend/tests/test_make_subsample.py
+from __future__ import annotations
+
+import csv
+
+from backend.scripts import make_subsample
+
+
+def test_open_arrow_csv_streams_multiline_cells(tmp_path):
+    """
+    Quoted multi-line cells (SYMPTOM_TEXT, HISTORY) that cross a block boundary
+    must not throw the streaming chunker out of sync.
+    """
+    path = tmp_path / "multiline.csv"
+    rows = [
+        (str(i), f"line one {i}\nline two\r\nline three", f"hx {i}\n\"quoted\"")
+        for i in range(5000)
+    ]
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["VAERS_ID", "SYMPTOM_TEXT", "HISTORY"])
+        w.writerows(rows)
+
+    reader = make_subsample._open_arrow_csv(path, None, 1000, "utf-8", block_size=4096)
+    table = reader.read_all()
+
+    assert table.num_rows == len(rows)
+    assert table.column("VAERS_ID").to_pylist() == [r[0] for r in rows]
+    assert table.column("SYMPTOM_TEXT").to_pylist() == [r[1] for r in rows]
+    assert table.column("HISTORY").to_pylist() == [r[2] for r in rows]
@@ -599,7 +599,8 @@ class Autocomplete {
     const chart = $("#trendsChart");
     if (!chart) return;
     chart.innerHTML = "";
-    const series = data?.series || [];
+    const months = data?.months || [], counts = data?.counts || [];
+    const series = months.map((month, i) => ({ month, n: counts[i] }));
     if (!series.length) {
       chart.textContent = "No trend data.";
       setStatus("Trends loaded: 0 months.", "ok");
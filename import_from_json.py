@@ -4,12 +4,26 @@ Import MongoDB data from JSON backup files
 Usage: python import_from_json.py
 """
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from pymongo import MongoClient
+from pymongo.write_concern import WriteConcern
 from tqdm import tqdm
 from bson import ObjectId
 from datetime import datetime
 
+try:
+    import ijson
+except ImportError:  # fall back to loading each part whole
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # fall back to json.load
+    orjson = None
+
 # Destination (Local)
 LOCAL_URI = "mongodb://localhost:27017"
 LOCAL_DB = "vaers_dev"
@@ -17,6 +31,21 @@ LOCAL_DB = "vaers_dev"
 # Source folder - change this to where your backup is
 BACKUP_DIR = Path.home() / "Desktop" / "vaers_backup"
 
+# Documents per insert_many call
+BATCH_SIZE = 10_000
+
+# Processes importing JSON parts in parallel
+WORKERS = os.cpu_count() or 1
+
+# Strings ObjectId() accepts: exactly 24 hex digits
+is_object_id = re.compile(r'[0-9a-fA-F]{24}').fullmatch
+
+# The API filters symptoms on a merged SYMPTOMS array (see backend/db/indexes.py);
+# older backups only have SYMPTOM1-5 and per-column indexes
+SYMPTOMS_COLLECTION = "vaers_symptoms"
+SYMPTOM_FIELDS = ("SYMPTOM1", "SYMPTOM2", "SYMPTOM3", "SYMPTOM4", "SYMPTOM5")
+OLD_SYMPTOM_INDEXES = {"idx_symptom1", "idx_symptom2", "idx_symptom3", "idx_symptom4", "idx_symptom5"}
+
 def parse_dates(doc):
     """Recursively parse ISO datetime strings back to datetime objects"""
     if isinstance(doc, dict):
@@ -33,6 +62,60 @@ def parse_dates(doc):
         return doc
     return doc
 
+def iter_docs(json_file):
+    """Yield the documents of one export part (a JSON array), streaming with ijson if installed"""
+    if ijson is not None:
+        with open(json_file, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    elif orjson is not None:
+        # ~3x faster than json.load, but the whole part is in memory
+        with open(json_file, 'rb') as f:
+            yield from orjson.loads(f.read())
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+def restore_types(doc, coll_name):
+    """Convert strings from the export back to proper types"""
+    # Parse datetime strings
+    doc = parse_dates(doc)
+
+    # Convert _id strings back to ObjectId if needed (keep as string if not a valid ObjectId)
+    _id = doc.get('_id')
+    if isinstance(_id, str) and is_object_id(_id):
+        doc['_id'] = ObjectId(_id)
+
+    # Merge SYMPTOM1-5 into a deduped SYMPTOMS array if the backup predates it
+    if coll_name == SYMPTOMS_COLLECTION and 'SYMPTOMS' not in doc:
+        doc['SYMPTOMS'] = list(dict.fromkeys(doc[f] for f in SYMPTOM_FIELDS if doc.get(f)))
+    return doc
+
+def import_part(coll_name, json_file):
+    """Insert one JSON part into a collection; runs in a worker process. Returns docs sent."""
+    # MongoClient is not fork-safe, so each task opens its own
+    client = MongoClient(LOCAL_URI, serverSelectionTimeoutMS=5000)
+    try:
+        # Fire-and-forget inserts (w=0): much faster for a dev restore, but insert
+        # errors are not reported and the counts are documents sent
+        bulk = client[LOCAL_DB][coll_name].with_options(write_concern=WriteConcern(w=0))
+
+        # Stream the part and insert in batches so only BATCH_SIZE docs are in memory
+        sent = 0
+        batch = []
+        for doc in iter_docs(json_file):
+            batch.append(restore_types(doc, coll_name))
+            if len(batch) == BATCH_SIZE:
+                bulk.insert_many(batch, ordered=False)
+                sent += len(batch)
+                batch = []
+
+        if batch:
+            bulk.insert_many(batch, ordered=False)
+            sent += len(batch)
+        return sent
+    finally:
+        client.close()
+
 def import_from_json():
     """Import all collections from JSON files"""
 
@@ -57,46 +140,41 @@ def import_from_json():
     # Get all collection directories
     collection_dirs = [d for d in BACKUP_DIR.iterdir() if d.is_dir()]
 
+    # Drop existing collections and collect their JSON parts (serial)
+    parts = []
     for coll_dir in collection_dirs:
         coll_name = coll_dir.name
         print(f"{'='*60}")
-        print(f"Importing collection: {coll_name}")
+        print(f"Preparing collection: {coll_name}")
         print(f"{'='*60}")
 
-        collection = db[coll_name]
-
         # Drop existing collection
         if coll_name in db.list_collection_names():
             print(f"Dropping existing collection '{coll_name}'...")
-            collection.drop()
+            db[coll_name].drop()
 
         # Get all JSON files for this collection
         json_files = sorted(coll_dir.glob(f"{coll_name}_part*.json"))
         print(f"Found {len(json_files)} file(s)")
-
-        total_docs = 0
-
-        for json_file in tqdm(json_files, desc="Processing files", unit="file"):
-            with open(json_file, 'r', encoding='utf-8') as f:
-                docs = json.load(f)
-
-            # Convert strings back to proper types
-            for doc in docs:
-                # Parse datetime strings
-                doc = parse_dates(doc)
-
-                # Convert _id strings back to ObjectId if needed
-                if '_id' in doc and isinstance(doc['_id'], str):
-                    try:
-                        doc['_id'] = ObjectId(doc['_id'])
-                    except:
-                        pass  # Keep as string if not valid ObjectId
-
-            if docs:
-                collection.insert_many(docs, ordered=False)
-                total_docs += len(docs)
-
-        print(f"✓ Imported {total_docs:,} documents")
+        parts.extend((coll_name, json_file) for json_file in json_files)
+
+    # Import all parts in parallel, one task per JSON file
+    print(f"\nImporting {len(parts)} file(s) with {WORKERS} worker(s)...")
+    totals = {coll_dir.name: 0 for coll_dir in collection_dirs}
+    with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+        futures = {executor.submit(import_part, coll_name, json_file): coll_name
+                   for coll_name, json_file in parts}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing files", unit="file"):
+            totals[futures[future]] += future.result()
+
+    # Report and create indexes (serial)
+    for coll_dir in collection_dirs:
+        coll_name = coll_dir.name
+        collection = db[coll_name]
+        print(f"{'='*60}")
+        print(f"Collection: {coll_name}")
+        print(f"{'='*60}")
+        print(f"✓ Imported {totals[coll_name]:,} documents")
 
         # Import indexes
         index_file = coll_dir / "_indexes.json"
@@ -105,6 +183,12 @@ def import_from_json():
             with open(index_file, 'r') as f:
                 indexes = json.load(f)
 
+            if coll_name == SYMPTOMS_COLLECTION:
+                # One multikey index on SYMPTOMS replaces the per-column ones
+                indexes = [idx for idx in indexes if idx.get('name') not in OLD_SYMPTOM_INDEXES]
+                if not any(idx.get('name') == 'idx_symptoms' for idx in indexes):
+                    indexes.append({'name': 'idx_symptoms', 'key': {'SYMPTOMS': 1}})
+
             for idx in indexes:
                 if idx.get('name') != '_id_':  # Skip default _id index
                     try: